@@ -0,0 +1,73 @@
+"""Deduplicated .dat blocks must decode to the same texts as plain ones."""
+
+import os
+import struct
+
+from extract_language_files import parse_dat_texts
+from repack_translations import pack_text_to_dat, read_dat_table
+
+MARKER = b'\xDC\x96\x58\x59'
+
+
+def build_dat(pairs):
+    """Build a source .dat block from (id_hex, text) pairs."""
+    count = len(pairs)
+    header = struct.pack('<IIII', count, 0, count, 0) + MARKER + b'\x00' * 4
+    code = bytes(range(1, count + 1))
+    padding = b'\xFF' + (code + b'\x80' * 16)[:16]
+    data_start = len(header) + count + 17
+    text_pos = data_start + count * 16
+    table = b''
+    texts = b''
+    for i, (id_hex, text) in enumerate(pairs):
+        text_bytes = text.encode('utf-8')
+        offset_pos = data_start + i * 16 + 8
+        table += bytes.fromhex(id_hex) + struct.pack('<II', text_pos + len(texts) - offset_pos, len(text_bytes))
+        texts += text_bytes
+    return header + code + padding + table + texts
+
+
+def pack(tmp_path, name, rows, dedup_texts):
+    out_dir = tmp_path / name
+    pack_text_to_dat(None, str(tmp_path / 'source'), str(out_dir), rows=rows, dedup_texts=dedup_texts)
+    return (out_dir / '1.dat').read_bytes()
+
+
+def test_dedup_texts_decodes_same_pairs(tmp_path):
+    source = [
+        ('0000000000000001', '确定'),
+        ('0000000000000002', '确定'),
+        ('0000000000000003', ''),
+        ('0000000000000004', '取消'),
+        ('0000000000000005', ''),
+        ('0000000000000006', '返回'),
+        ('0000000000000007', '确定'),
+    ]
+    (tmp_path / 'source').mkdir()
+    (tmp_path / 'source' / '1.dat').write_bytes(build_dat(source))
+    rows = [
+        {'ID': '0000000000000001', 'English': 'OK', 'Target': 'Đồng ý'},
+        {'ID': '0000000000000002', 'English': 'OK', 'Target': 'Đồng ý'},
+        {'ID': '0000000000000004', 'English': 'Cancel', 'Target': ''},
+        {'ID': '0000000000000006', 'English': 'OK', 'Target': ''},
+    ]
+    
+    plain = pack(tmp_path, 'plain', rows, dedup_texts=False)
+    dedup = pack(tmp_path, 'dedup', rows, dedup_texts=True)
+    
+    assert len(dedup) < len(plain)
+    assert parse_dat_texts(dedup) == parse_dat_texts(plain)
+    assert parse_dat_texts(plain) == [
+        ('0000000000000001', 'Đồng ý'),
+        ('0000000000000002', 'Đồng ý'),
+        ('0000000000000003', ''),
+        ('0000000000000004', 'Cancel'),
+        ('0000000000000005', ''),
+        ('0000000000000006', 'OK'),
+        ('0000000000000007', '确定'),
+    ]
+    
+    plain_entries, plain_errors = read_dat_table(plain)
+    dedup_entries, dedup_errors = read_dat_table(dedup)
+    assert plain_errors == dedup_errors == []
+    assert dedup_entries == plain_entries
@@ -0,0 +1,17 @@
+"""Glossary terms match on word boundaries, also when lowercasing changes their length."""
+
+from repack_translations import build_automaton, find_terms
+
+
+def test_word_boundaries():
+    automaton = build_automaton(['Sect', '门派'])
+    assert find_terms('Join the sect.', automaton) == {0}
+    assert find_terms('Section 2', automaton) == set()
+    assert find_terms('加入门派吧', automaton) == {1}
+
+
+def test_term_longer_when_lowercased():
+    # 'İ'.lower() is two characters ('i' + combining dot above)
+    automaton = build_automaton(['İzmir'])
+    assert find_terms('Visit İzmir', automaton) == {0}
+    assert find_terms('Visitİzmir', automaton) == set()
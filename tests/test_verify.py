@@ -0,0 +1,68 @@
+"""verify checks a repacked binary against its manifest and the template."""
+
+import json
+
+from repack_translations import pack_dat_to_binary, pack_text_to_dat, verify_binary, write_verify_manifest
+from test_dedup_texts import build_dat
+
+SOURCE = [
+    ('0000000000000001', '确定'),
+    ('0000000000000002', '确定'),
+    ('0000000000000003', '取消'),
+]
+ROWS = [
+    {'ID': '0000000000000001', 'English': 'OK', 'Target': 'Đồng ý'},
+    {'ID': '0000000000000002', 'English': 'OK', 'Target': 'Đồng ý'},
+    {'ID': '0000000000000003', 'English': 'Cancel', 'Target': ''},
+]
+
+
+def setup_files(tmp_path, rows):
+    (tmp_path / 'source').mkdir()
+    (tmp_path / 'source' / 'words_0.dat').write_bytes(build_dat(SOURCE))
+    (tmp_path / 'source' / 'words_1.dat').write_bytes(build_dat(SOURCE[:1]))
+    pack_dat_to_binary(str(tmp_path / 'source'), str(tmp_path / 'source_binary'))
+    template = tmp_path / 'template.json'
+    template.write_text(json.dumps(rows, ensure_ascii=False), encoding='utf-8')
+    return str(template), str(tmp_path / 'source_binary')
+
+
+def repack(tmp_path, name, template, dedup_texts=False):
+    dat_dir = tmp_path / (name + '_dat')
+    pack_text_to_dat(template, str(tmp_path / 'source'), str(dat_dir), dedup_texts=dedup_texts)
+    binary = str(tmp_path / name)
+    blocks = pack_dat_to_binary(str(dat_dir), binary)
+    write_verify_manifest(binary + '.verify.json', blocks, template_file=template)
+    return binary
+
+
+def test_verify_passes_plain_and_dedup(tmp_path):
+    template, source_binary = setup_files(tmp_path, ROWS)
+    plain = repack(tmp_path, 'plain', template)
+    dedup = repack(tmp_path, 'dedup', template, dedup_texts=True)
+    
+    assert verify_binary(plain, plain + '.verify.json', template, source_binary, jobs=1) == []
+    # Table hashes ignore the text layout, so a plain run's manifest also fits
+    assert verify_binary(dedup, plain + '.verify.json', template, source_binary, jobs=1) == []
+
+
+def test_verify_reports_changed_template(tmp_path):
+    template, source_binary = setup_files(tmp_path, ROWS)
+    binary = repack(tmp_path, 'plain', template)
+    changed = tmp_path / 'changed.json'
+    rows = [dict(row) for row in ROWS]
+    rows[2]['Target'] = 'Hủy'
+    changed.write_text(json.dumps(rows, ensure_ascii=False), encoding='utf-8')
+    
+    problems = verify_binary(binary, binary + '.verify.json', str(changed), source_binary, jobs=1)
+    assert problems[0].startswith('template changed since packing')
+    assert problems[1:] == ['block 0 (words_0.dat): mismatched ID 0000000000000003']
+
+
+def test_verify_without_manifest_uses_template(tmp_path):
+    template, source_binary = setup_files(tmp_path, ROWS)
+    binary = repack(tmp_path, 'plain', template)
+    
+    assert verify_binary(binary, None, template, source_binary, jobs=1) == []
+    problems = verify_binary(binary, None, template, source_binary, mode='target', jobs=1)
+    assert problems == ['block 0 (#0): mismatched ID 0000000000000003']
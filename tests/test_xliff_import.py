@@ -0,0 +1,69 @@
+"""XLIFF import reads only the unit's own source/target/note elements."""
+
+from repack_translations import iter_xliff_rows
+
+XLIFF_12 = '''<?xml version="1.0" encoding="UTF-8"?>
+<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">
+  <file original="translation_template.json" source-language="en" target-language="vi" datatype="plaintext">
+    <header>
+      <note from="wwm:source-column">English</note>
+      <note from="wwm:target-column">Target</note>
+      <note from="wwm:columns">English,Chinese,Target</note>
+    </header>
+    <body>
+      <trans-unit id="0000000000000001" xml:space="preserve">
+        <source>Sect label 1</source>
+        <target>Phái nhãn 1</target>
+        <note from="Chinese">门派标签1</note>
+        <alt-trans match-quality="90">
+          <source>Sect label 2</source>
+          <target>Phái nhãn 2</target>
+          <note from="Chinese">门派标签2</note>
+        </alt-trans>
+      </trans-unit>
+    </body>
+  </file>
+</xliff>
+'''
+
+XLIFF_20 = '''<?xml version="1.0" encoding="UTF-8"?>
+<xliff xmlns="urn:oasis:names:tc:xliff:document:2.0" xmlns:mtc="urn:oasis:names:tc:xliff:matches:2.0"
+       version="2.0" srcLang="en" trgLang="vi">
+  <file id="f1" original="translation_template.json">
+    <notes>
+      <note category="wwm:source-column">English</note>
+      <note category="wwm:target-column">Target</note>
+      <note category="wwm:columns">English,Chinese,Target</note>
+    </notes>
+    <unit id="0000000000000001" xml:space="preserve">
+      <mtc:matches>
+        <mtc:match ref="#1">
+          <source>Sect label 2</source>
+          <target>Phái nhãn 2</target>
+        </mtc:match>
+      </mtc:matches>
+      <notes>
+        <note category="Chinese">门派标签1</note>
+      </notes>
+      <segment>
+        <source>Sect label 1</source>
+        <target>Phái nhãn 1</target>
+      </segment>
+    </unit>
+  </file>
+</xliff>
+'''
+
+EXPECTED = [{'ID': '0000000000000001', 'English': 'Sect label 1', 'Chinese': '门派标签1', 'Target': 'Phái nhãn 1'}]
+
+
+def test_xliff_12_skips_alt_trans(tmp_path):
+    path = tmp_path / 'template.xlf'
+    path.write_text(XLIFF_12, encoding='utf-8')
+    assert list(iter_xliff_rows(str(path))) == EXPECTED
+
+
+def test_xliff_20_skips_matches(tmp_path):
+    path = tmp_path / 'template.xliff'
+    path.write_text(XLIFF_20, encoding='utf-8')
+    assert list(iter_xliff_rows(str(path))) == EXPECTED
@@ -8,166 +8,206 @@ import os
 import sys
 import struct
 import json
+import heapq
+import shutil
+import re
+import time
+import hashlib
+import sqlite3
 import pyzstd
 
+from file_utils import iter_json_array, write_json_array, hash_file
+
 # Set UTF-8 encoding for Windows
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
     sys.stderr.reconfigure(encoding='utf-8')
 
-def extract_file_to_dat(input_file, output_dir):
-    """Extract binary file to .dat files."""
+def parse_dat_texts(data):
+    """Parse texts of one .dat block held in memory.
+    
+    Returns:
+        List of (id, text) in table order, with control characters removed
+    """
+    pairs = []
+    if data[16:20] != b'\xDC\x96\x58\x59':
+        return pairs
+    
     try:
-        base_name = os.path.splitext(os.path.basename(input_file))[0]
-        os.makedirs(output_dir, exist_ok=True)
-
-        with open(input_file, 'rb') as f:
-            if f.read(4) != b'\xEF\xBE\xAD\xDE':
-                return False
-
-            f.read(4)  # Version
-            offset_count_bytes = f.read(4)
-            offset_count = struct.unpack('<I', offset_count_bytes)[0] + 1
-
-            if offset_count == 1:
-                comp_block_len = struct.unpack('<I', f.read(4))[0]
-                comp_block = f.read(comp_block_len)
-
-                if len(comp_block) < comp_block_len:
-                    return False
-
-                header = comp_block[:9]
-                comp_data_part = comp_block[9:]
+        count_full = struct.unpack_from('<I', data, 0)[0]
+        # Code block starts at position 24, followed by 17 bytes padding
+        data_start = 24 + count_full + 17
+        
+        for i in range(count_full):
+            pos = data_start + (i * 16)
+            id_hex = data[pos:pos + 8].hex()
+            # Skip entry with all-zero ID (likely metadata/header entry)
+            if id_hex == '0000000000000000':
+                continue
+            offset_text, lenght = struct.unpack_from('<II', data, pos + 8)
+            # offset_text is relative to where it is stored (right after the ID)
+            text_pos = pos + 8 + offset_text
+            text = data[text_pos:text_pos + lenght].decode('utf-8', errors='ignore')
+            # Remove NULL bytes and DEL character
+            text = text.replace('\x00', '').replace('\x7f', '')
+            # Remove other control characters (keep only printable chars, newline, carriage return, tab)
+            text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\r\t')
+            pairs.append((id_hex, text))
+    except Exception:
+        pass
+    
+    return pairs
 
-                if len(header) < 9:
-                    return False
-                    
-                comp_type, comp_size, decomp_size = struct.unpack('<BII', header)
+def merge_texts(texts, pairs):
+    """Add (id, text) pairs to texts; a non-empty text wins over an empty one."""
+    for id_hex, text in pairs:
+        # Skip if only control characters remain
+        if not text.strip():
+            # Keep empty entries but mark as empty (needed for template)
+            if id_hex not in texts:
+                texts[id_hex] = ''
+        else:
+            # No need to escape for JSON - JSON handles special characters automatically
+            if id_hex not in texts or not texts[id_hex]:
+                texts[id_hex] = text
 
-                if comp_type == 0x04:
-                    try:
-                        decomp_data = pyzstd.decompress(comp_data_part)
-                        output_path = os.path.join(output_dir, f"{base_name}_0.dat")
-                        with open(output_path, 'wb') as out_f:
-                            out_f.write(decomp_data)
-                        return True
-                    except Exception:
-                        return False
-            else:
-                offsets = [struct.unpack('<I', f.read(4))[0] for _ in range(offset_count)]
-                data_start = f.tell()
-                
-                extracted = 0
-                for i in range(offset_count):
-                    current_offset = offsets[i]
-                    if i == (offset_count - 1):
-                        continue
-                    else:
-                        next_offset = offsets[i + 1]
-                    
-                    block_len = next_offset - current_offset
-                    f.seek(data_start + current_offset)
-                    comp_block = f.read(block_len)
+def read_container_blocks(content):
+    """Split a binary language file (held in memory) into its compressed blocks.
+    
+    Returns:
+        List of compressed blocks (block index = position in the list),
+        or None if this is not a language file
+    """
+    if content[:4] != b'\xEF\xBE\xAD\xDE' or len(content) < 16:
+        return None
+    
+    offset_count = struct.unpack_from('<I', content, 8)[0] + 1
+    if offset_count == 1:
+        comp_block_len = struct.unpack_from('<I', content, 12)[0]
+        comp_block = content[16:16 + comp_block_len]
+        return [comp_block] if len(comp_block) == comp_block_len else []
+    
+    offsets = struct.unpack_from(f'<{offset_count}I', content, 12)
+    data_start = 12 + offset_count * 4
+    blocks = []
+    for i in range(offset_count - 1):
+        block_len = offsets[i + 1] - offsets[i]
+        comp_block = content[data_start + offsets[i]:data_start + offsets[i] + max(block_len, 0)]
+        blocks.append(comp_block if len(comp_block) == block_len else b'')
+    return blocks
 
-                    if len(comp_block) < block_len or len(comp_block) < 9:
-                        continue
+def decode_block(comp_block):
+    """Decompress one ZSTD block; returns .dat bytes or None."""
+    if len(comp_block) < 9:
+        return None
+    comp_type, comp_size, decomp_size = struct.unpack('<BII', comp_block[:9])
+    if comp_type != 0x04:
+        return None
+    try:
+        return pyzstd.decompress(comp_block[9:])
+    except Exception:
+        return None
 
-                    header = comp_block[:9]
-                    comp_data_part = comp_block[9:]
-                    comp_type, comp_size, decomp_size = struct.unpack('<BII', header)
-                    
-                    if comp_type == 0x04:
-                        try:
-                            decomp_data = pyzstd.decompress(comp_data_part)
-                            output_path = os.path.join(output_dir, f"{base_name}_{i}.dat")
-                            with open(output_path, 'wb') as out_f:
-                                out_f.write(decomp_data)
-                            extracted += 1
-                        except Exception:
-                            pass
+# Layout version of the extraction cache; a cache with another version is rebuilt
+EXTRACT_CACHE_VERSION = 2
 
-                return extracted > 0
+def file_state(path):
+    """Size and mtime of a file, as recorded in the extraction manifest."""
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
 
-    except Exception:
+def same_file(old_state, path):
+    """True if the file (None: missing) still matches its manifest state.
+    
+    Size and mtime are compared first. If only the mtime changed (file copied or
+    touched), the content hash decides and the recorded mtime is refreshed.
+    """
+    if old_state is None or path is None:
+        return old_state is None and path is None
+    new_state = file_state(path)
+    if old_state['size'] != new_state['size']:
         return False
+    if old_state['mtime_ns'] == new_state['mtime_ns']:
+        return True
+    if not old_state.get('sha256') or hash_file(path) != old_state['sha256']:
+        return False
+    old_state['mtime_ns'] = new_state['mtime_ns']
+    return True
 
-def extract_texts_from_dat(dat_dir):
-    """Extract texts from .dat files, return dict {id: text}."""
-    texts = {}
+def extract_blocks_incremental(input_file, cache_prefix, old_state=None):
+    """Extract texts of a binary file, decoding only blocks that changed.
     
-    for filename in os.listdir(dat_dir):
-        if filename.endswith('.dat'):
-            full_path = os.path.join(dat_dir, filename)
-            
-            try:
-                with open(full_path, 'rb') as f:
-                    f.seek(16)
-                    
-                    if f.read(4) != b'\xDC\x96\x58\x59':
-                        continue
-                    
-                    f.seek(0)
-                    count_full = struct.unpack('<I', f.read(4))[0]
-                    f.read(4)  # Padding (position 4-7)
-                    count_text = struct.unpack('<I', f.read(4))[0]
-                    f.read(12)  # Padding (4 bytes) + Marker (4 bytes) + Padding (4 bytes) = 12 bytes total
-                    # After reading 12 bytes from position 12, we're at position 24
-                    # Code block starts at position 24 (current position)
-                    code = f.read(count_full).hex()  # Read code block and convert to hex (from position 24)
-                    f.read(17)  # Padding
-                    data_start = f.tell()  # Should be 24 + count_full + 17
-                    
-                    for i in range(count_full):
-                        f.seek(data_start + (i * 16))
-                        id_hex = f.read(8).hex()
-                        # Skip entry with all-zero ID (likely metadata/header entry)
-                        if id_hex == '0000000000000000':
-                            continue
-                        start_text_offset = f.tell()  # Position after reading ID (8 bytes)
-                        offset_text = struct.unpack('<I', f.read(4))[0]
-                        lenght = struct.unpack('<I', f.read(4))[0]
-                        # offset_text is relative to start_text_offset (where offset is stored)
-                        # So text position = start_text_offset + offset_text
-                        f.seek(start_text_offset + offset_text)
-                        text = f.read(lenght).decode('utf-8', errors='ignore')
-                        # Remove NULL bytes and DEL character
-                        text = text.replace('\x00', '').replace('\x7f', '')
-                        # Remove other control characters (keep only printable chars, newline, carriage return, tab)
-                        text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\r\t')
-                        # Skip if only control characters remain
-                        if not text.strip():
-                            # Keep empty entries but mark as empty (needed for template)
-                            if id_hex not in texts:
-                                texts[id_hex] = ''
-                        else:
-                            # No need to escape for JSON - JSON handles special characters automatically
-                            if id_hex not in texts or not texts[id_hex]:
-                                texts[id_hex] = text
-            except Exception:
+    The texts of every block are cached in {cache_prefix}_{index}.jsonl and reused
+    while the block's compressed bytes keep the same hash.
+    
+    Args:
+        old_state: Manifest entry of the previous extraction (None: decode everything)
+    
+    Returns:
+        (texts, state, decoded) where texts is {id: text} (None if nothing could be
+        extracted), state is the new manifest entry and decoded the number of decoded blocks
+    """
+    state = file_state(input_file)
+    with open(input_file, 'rb') as f:
+        content = f.read()
+    state['sha256'] = hashlib.sha256(content).hexdigest()
+    state['blocks'] = []
+    
+    blocks = read_container_blocks(content)
+    if not blocks:
+        return None, state, 0
+    
+    old_blocks = old_state.get('blocks', []) if old_state else []
+    texts = {}
+    decoded = 0
+    extracted = 0
+    for i, comp_block in enumerate(blocks):
+        digest = hashlib.sha256(comp_block).hexdigest()
+        state['blocks'].append(digest)
+        cache_file = f"{cache_prefix}_{i}.jsonl"
+        
+        if i < len(old_blocks) and old_blocks[i] == digest and os.path.exists(cache_file):
+            pairs = iter_run(cache_file)
+        else:
+            data = decode_block(comp_block)
+            if data is None:
+                if os.path.exists(cache_file):
+                    os.remove(cache_file)
                 continue
+            pairs = parse_dat_texts(data)
+            write_pairs(pairs, cache_file)
+            decoded += 1
+        merge_texts(texts, pairs)
+        extracted += 1
     
-    return texts
+    return (texts if extracted else None), state, decoded
 
-def extract_language_file(input_file, language_code, output_dir, diff_file=None):
-    """Extract a single language file from binary format.
+def extract_language_incremental(language_code, input_file, cache_dir, diff_file=None, old_entry=None):
+    """Extract a single language file, reusing cached blocks of the previous extraction.
     
     Args:
-        input_file: Main binary file path
         language_code: Language code for naming
-        output_dir: Output directory
+        input_file: Main binary file path
+        cache_dir: Extraction cache directory
         diff_file: Optional diff file path to merge
+        old_entry: Manifest entry of the previous extraction of this language
+    
+    Returns:
+        (texts, entry): texts is {id: text} (None if it could not be extracted) and
+        entry the new manifest entry
     """
-    temp_dir = os.path.join(output_dir, f"temp_{language_code}")
-    os.makedirs(temp_dir, exist_ok=True)
+    old_entry = old_entry or {}
+    lang_cache_dir = os.path.join(cache_dir, language_code)
+    os.makedirs(lang_cache_dir, exist_ok=True)
     
     print(f"   Extracting {language_code}...")
-    if not extract_file_to_dat(input_file, temp_dir):
+    texts, main_state, decoded = extract_blocks_incremental(
+        input_file, os.path.join(lang_cache_dir, "main"), old_entry.get('main'))
+    if texts is None:
         print(f"   ❌ Failed to extract {language_code}")
-        return None
-    
-    print(f"   Extracting texts from {language_code}...")
-    texts = extract_texts_from_dat(temp_dir)
-    print(f"   ✅ Found {len(texts)} texts")
+        return None, None
+    entry = {'main': main_state, 'diff': None}
+    print(f"   ✅ Found {len(texts)} texts (decoded {decoded} of {len(main_state['blocks'])} blocks)")
     
     # Extract and merge diff file if provided
     if diff_file and os.path.exists(diff_file):
@@ -175,38 +215,299 @@ def extract_language_file(input_file, language_code, output_dir, diff_file=None)
         file_size = os.path.getsize(diff_file)
         if file_size > 16:  # More than just magic + version + offset_count + comp_block_len
             print(f"   Extracting {language_code} diff...")
-            diff_temp_dir = os.path.join(output_dir, f"temp_{language_code}_diff")
-            os.makedirs(diff_temp_dir, exist_ok=True)
-            if extract_file_to_dat(diff_file, diff_temp_dir):
-                diff_texts = extract_texts_from_dat(diff_temp_dir)
-                if diff_texts:
-                    print(f"   ✅ Found {len(diff_texts)} diff texts")
-                    # Merge diff texts into main texts (diff overrides main)
-                    texts.update(diff_texts)
-                    print(f"   ✅ Merged: {len(texts)} total texts")
-                else:
-                    # Diff file may be a placeholder (copied from official for verification)
-                    # This is common in modding to pass game file verification
-                    print(f"   ℹ️  Diff file exists but contains no texts (may be verification placeholder)")
-                import shutil
-                shutil.rmtree(diff_temp_dir, ignore_errors=True)
+            diff_texts, entry['diff'], decoded = extract_blocks_incremental(
+                diff_file, os.path.join(lang_cache_dir, "diff"), old_entry.get('diff'))
+            if diff_texts:
+                print(f"   ✅ Found {len(diff_texts)} diff texts")
+                # Merge diff texts into main texts (diff overrides main)
+                texts.update(diff_texts)
+                print(f"   ✅ Merged: {len(texts)} total texts")
+            elif diff_texts is not None:
+                # Diff file may be a placeholder (copied from official for verification)
+                # This is common in modding to pass game file verification
+                print(f"   ℹ️  Diff file exists but contains no texts (may be verification placeholder)")
             else:
                 # Diff file may have non-ZSTD blocks (e.g., comp_type 0) used for verification
                 # This is normal for modded diff files copied from official
                 print(f"   ℹ️  Diff file cannot be extracted (likely verification placeholder from official)")
         else:
+            entry['diff'] = file_state(diff_file)
+            entry['diff']['sha256'] = hash_file(diff_file)
             print(f"   ℹ️  Diff file exists but is empty (no changes from official)")
     
-    # Cleanup temp directory
-    import shutil
-    shutil.rmtree(temp_dir, ignore_errors=True)
+    return texts, entry
+
+def write_pairs(pairs, output_file):
+    """Write (id, text) pairs to a file, one JSON [id, text] pair per line."""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for id_hex, text in pairs:
+            f.write(json.dumps([id_hex, text], ensure_ascii=False))
+            f.write('\n')
+
+def write_sorted_run(texts, run_file):
+    """Write {id: text} to a run file sorted by ID (one JSON [id, text] pair per line)."""
+    write_pairs(((id_hex, texts[id_hex]) for id_hex in sorted(texts)), run_file)
+
+def iter_run(run_file, tag=None):
+    """Yield (id, text) pairs from a run file, or (id, tag, text) if tag is given."""
+    with open(run_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            id_hex, text = json.loads(line)
+            if tag is None:
+                yield id_hex, text
+            else:
+                yield id_hex, tag, text
+
+def merge_runs(field_names, run_files):
+    """Streaming k-way merge of sorted runs into template rows (one row per ID).
+    
+    Args:
+        field_names: Template column name for each run
+        run_files: Sorted run files, in the same order as field_names
+    """
+    streams = [iter_run(run_file, tag=i) for i, run_file in enumerate(run_files)]
+    entry = None
+    for id_hex, i, text in heapq.merge(*streams):
+        if entry is None or entry["ID"] != id_hex:
+            if entry is not None:
+                # Add Target column (empty by default, to be filled by translators)
+                entry["Target"] = ''
+                yield entry
+            entry = {"ID": id_hex}
+            for field_name in field_names:
+                entry[field_name] = ''
+        entry[field_names[i]] = text
+    if entry is not None:
+        entry["Target"] = ''
+        yield entry
+
+# CJK ideographs, kana and hangul are indexed as character bigrams, other words as whole words
+CJK_CHARS = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af'
+TOKEN_RE = re.compile(f'([{CJK_CHARS}]+)|([^\\W{CJK_CHARS}]+)')
+
+def tokenize(text):
+    """Split lowercased text into index tokens (words and CJK bigrams)."""
+    tokens = set()
+    for match in TOKEN_RE.finditer(text):
+        cjk_run = match.group(1)
+        if cjk_run is None:
+            tokens.add(match.group(2))
+        elif len(cjk_run) == 1:
+            tokens.add(cjk_run)
+        else:
+            tokens.update(cjk_run[i:i + 2] for i in range(len(cjk_run) - 1))
+    return tokens
+
+def query_tokens(query, term=False):
+    """Tokens that every matching row must contain.
     
-    return texts
+    Returns:
+        (exact, prefixes): exact tokens and word prefixes. In substring mode a word at the
+        start or end of the query may be cut off, so it is only usable as a prefix
+        (last word) or not at all (first word). A single CJK character is only indexed
+        when it stands alone, so it is never required here.
+    """
+    exact = set()
+    prefixes = set()
+    for match in TOKEN_RE.finditer(query):
+        cjk_run = match.group(1)
+        if cjk_run is not None:
+            if len(cjk_run) > 1:
+                exact.update(cjk_run[i:i + 2] for i in range(len(cjk_run) - 1))
+        elif term or 0 < match.start() and match.end() < len(query):
+            exact.add(match.group(2))
+        elif 0 < match.start():
+            prefixes.add(match.group(2))
+    return exact, prefixes
+
+def open_search_index(index_file):
+    """Open (or create) the search index database."""
+    conn = sqlite3.connect(index_file)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS docs (doc INTEGER PRIMARY KEY, id TEXT UNIQUE, digest TEXT,
+                                         row TEXT, text TEXT, tokens TEXT);
+        CREATE TABLE IF NOT EXISTS postings (token TEXT, doc INTEGER, PRIMARY KEY (token, doc)) WITHOUT ROWID;
+    """)
+    return conn
+
+def template_stamp(template_file):
+    """Size and mtime of the template, used to detect changes."""
+    st = os.stat(template_file)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+def read_index_stamp(index_file):
+    """Template stamp the index was last updated for (None if missing).
+    
+    An index that SQLite cannot read is deleted, so the next update rebuilds it.
+    """
+    if not os.path.exists(index_file):
+        return None
+    try:
+        conn = open_search_index(index_file)
+        try:
+            stamp = conn.execute("SELECT value FROM meta WHERE key = 'template'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        print(f"⚠️  Search index unreadable ({e}), rebuilding: {index_file}")
+        os.remove(index_file)
+        return None
+    return stamp[0] if stamp else None
+
+def update_search_index(index_file, template_file):
+    """Build or incrementally update the search index for a template.
+    
+    Only rows whose content changed since the last update are re-tokenized. The
+    template stamp is written after the rows are committed, so an interrupted
+    update is picked up again by the next search.
+    
+    Returns:
+        (added, updated, removed) row counts
+    """
+    conn = open_search_index(index_file)
+    existing = {id_hex: (doc, digest) for doc, id_hex, digest in conn.execute("SELECT doc, id, digest FROM docs")}
+    seen = set()
+    added = updated = 0
+    
+    with conn:
+        for row in iter_json_array(template_file):
+            id_hex = row.get('ID') or ''
+            if not id_hex:
+                continue
+            row_json = json.dumps(row, ensure_ascii=False)
+            digest = hashlib.sha1(row_json.encode('utf-8')).hexdigest()
+            seen.add(id_hex)
+            old = existing.get(id_hex)
+            if old and old[1] == digest:
+                continue
+            
+            text = '\n'.join(str(value) for key, value in row.items() if key != 'ID' and value).lower()
+            tokens = sorted(tokenize(text))
+            if old:
+                doc = old[0]
+                old_tokens = json.loads(conn.execute("SELECT tokens FROM docs WHERE doc = ?", (doc,)).fetchone()[0])
+                conn.executemany("DELETE FROM postings WHERE token = ? AND doc = ?", ((t, doc) for t in old_tokens))
+                conn.execute("UPDATE docs SET digest = ?, row = ?, text = ?, tokens = ? WHERE doc = ?",
+                             (digest, row_json, text, json.dumps(tokens, ensure_ascii=False), doc))
+                updated += 1
+            else:
+                doc = conn.execute("INSERT INTO docs (id, digest, row, text, tokens) VALUES (?, ?, ?, ?, ?)",
+                                   (id_hex, digest, row_json, text, json.dumps(tokens, ensure_ascii=False))).lastrowid
+                added += 1
+            conn.executemany("INSERT INTO postings (token, doc) VALUES (?, ?)", ((t, doc) for t in tokens))
+        
+        removed = [(doc, id_hex) for id_hex, (doc, _) in existing.items() if id_hex not in seen]
+        for doc, id_hex in removed:
+            old_tokens = json.loads(conn.execute("SELECT tokens FROM docs WHERE doc = ?", (doc,)).fetchone()[0])
+            conn.executemany("DELETE FROM postings WHERE token = ? AND doc = ?", ((t, doc) for t in old_tokens))
+            conn.execute("DELETE FROM docs WHERE doc = ?", (doc,))
+    
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('template', ?)", (template_stamp(template_file),))
+    conn.close()
+    return added, updated, len(removed)
+
+def search_index(index_file, query, columns=None, term=False, limit=50):
+    """Find rows containing query (substring, or whole term if term=True) in any column.
+    
+    Returns:
+        List of (id, {column: text}) with only the matching columns
+    """
+    q = query.lower()
+    if term:
+        pattern = re.compile(f'(?<![^\\W{CJK_CHARS}]){re.escape(q)}(?![^\\W{CJK_CHARS}])')
+        matches = lambda text: pattern.search(text.lower()) is not None
+    else:
+        matches = lambda text: q in text.lower()
+    
+    conn = open_search_index(index_file)
+    exact, prefixes = query_tokens(q, term=term)
+    if exact or prefixes:
+        # Intersect postings, rarest tokens first
+        candidates = None
+        postings = [conn.execute("SELECT doc FROM postings WHERE token = ?", (t,)) for t in exact]
+        postings += [conn.execute("SELECT doc FROM postings WHERE token >= ? AND token < ?", (p, p + '\U0010ffff'))
+                     for p in prefixes]
+        for docs in sorted((set(d for (d,) in cursor) for cursor in postings), key=len):
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                break
+        candidates = sorted(candidates)
+        cursors = (conn.execute(f"SELECT id, row FROM docs WHERE doc IN ({','.join('?' * len(chunk))})", chunk)
+                   for chunk in (candidates[i:i + 500] for i in range(0, len(candidates), 500)))
+        rows = (r for cursor in cursors for r in cursor)
+    else:
+        # Nothing indexable (e.g. a single character): scan the lowercased text column
+        rows = conn.execute("SELECT id, row FROM docs WHERE instr(text, ?) > 0", (q,))
+    
+    results = []
+    for id_hex, row_json in rows:
+        row = json.loads(row_json)
+        hits = {key: value for key, value in row.items()
+                if key != 'ID' and value and (not columns or key in columns) and matches(value)}
+        if hits:
+            results.append((id_hex, hits))
+            if len(results) >= limit:
+                break
+    
+    conn.close()
+    return results
+
+def search_main(argv):
+    """Search command: find strings across all language columns of the template."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='extract_language_files.py search',
+                                     description='Search the translation template (substring or term query)')
+    parser.add_argument('query', help='Text to search for')
+    parser.add_argument('--template', default='translation/translation_template.json',
+                       help='Translation template JSON file')
+    parser.add_argument('--index', default=None,
+                       help='Search index file (default: template name + .index)')
+    parser.add_argument('--column', action='append', default=None,
+                       help='Only search this column (repeatable, default: all columns)')
+    parser.add_argument('--term', action='store_true',
+                       help='Match whole terms instead of any substring')
+    parser.add_argument('--limit', type=int, default=50,
+                       help='Maximum number of rows to show (default: 50)')
+    
+    args = parser.parse_args(argv)
+    index_file = args.index or os.path.splitext(args.template)[0] + '.index'
+    
+    if not os.path.exists(args.template):
+        print(f"❌ Template not found: {args.template}")
+        return 1
+    
+    # Bring the index up to date if the template changed since it was built
+    stamp = read_index_stamp(index_file)
+    if stamp != template_stamp(args.template):
+        print(f"🔄 Updating search index: {index_file}")
+        added, updated, removed = update_search_index(index_file, args.template)
+        print(f"   ✅ {added} added, {updated} updated, {removed} removed")
+    
+    start = time.perf_counter()
+    results = search_index(index_file, args.query, columns=args.column, term=args.term, limit=args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    for id_hex, hits in results:
+        print(f"{id_hex}")
+        for column, text in hits.items():
+            print(f"   {column}: {text}")
+    print(f"🔍 {len(results)} row(s) in {elapsed:.1f} ms" + (" (limit reached)" if len(results) >= args.limit else ""))
+    return 0
 
 def main():
     """Main function."""
     import argparse
     
+    # Subcommands (plain `extract_language_files.py [options]` still runs the extraction)
+    commands = {
+        'search': search_main,
+    }
+    if len(sys.argv) > 1 and sys.argv[1] in commands:
+        sys.exit(commands[sys.argv[1]](sys.argv[2:]))
+    
     parser = argparse.ArgumentParser(description='Extract texts from game language files')
     parser.add_argument('--source-dir', default='language/source',
                        help='Directory containing source language files')
@@ -216,6 +517,10 @@ def main():
                        help='Output directory for JSON files')
     parser.add_argument('--languages', nargs='+', default=['en', 'cn', 'ko', 'ja'],
                        help='Languages to extract (default: en cn ko ja)')
+    parser.add_argument('--force', action='store_true',
+                       help='Ignore the extraction cache and re-extract everything')
+    parser.add_argument('--build-index', action='store_true',
+                       help='Build/update the search index next to the template (for the search command)')
     
     args = parser.parse_args()
     
@@ -234,8 +539,44 @@ def main():
         'tw': 'translate_words_map_zh_tw',  # Chinese traditional
     }
     
+    # Field name mapping (default to capitalized lang_code if not specified)
+    field_names = {
+        'en': 'English',
+        'cn': 'Chinese',
+        'ko': 'Korean',
+        'ja': 'Japanese',
+        'vi': 'Vietnamese',
+        'de': 'German',
+        'fr': 'French',
+        'es': 'Spanish',
+        'tw': 'Chinese_Traditional'
+    }
+    
+    # Each language is written to a run file sorted by ID, so only one language
+    # is held in memory at a time; the template is built by merging the runs.
+    # Runs, per-block texts and the manifest are kept in the cache directory so
+    # unchanged languages and blocks are not decoded again on the next run.
+    cache_dir = os.path.join(args.output_dir, ".extract_cache")
+    manifest_file = os.path.join(cache_dir, "manifest.json")
+    if args.force:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    manifest = {'version': EXTRACT_CACHE_VERSION, 'languages': {}, 'template': None}
+    if os.path.exists(manifest_file):
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            old_manifest = json.load(f)
+        if old_manifest.get('version') == EXTRACT_CACHE_VERSION:
+            manifest = old_manifest
+        else:
+            print(f"ℹ️  Extraction cache has version {old_manifest.get('version')}, rebuilding\n")
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            os.makedirs(cache_dir, exist_ok=True)
+    
     # Extract all requested languages
-    extracted_texts = {}
+    run_fields = []
+    run_files = []
+    changed = False
     for lang_code in args.languages:
         # Use special mapping if exists, otherwise use standard pattern
         if lang_code in lang_map_special:
@@ -248,64 +589,63 @@ def main():
         
         if os.path.exists(main_file):
             lang_key = lang_code
-            texts = extract_language_file(
-                main_file, lang_code, args.output_dir,
-                diff_file=diff_file if os.path.exists(diff_file) else None
-            )
-            if texts:
-                extracted_texts[lang_key] = texts
-                # Save individual language file
-                output_filename = f"{lang_key}.json"
-                output_file = os.path.join(args.output_dir, output_filename)
-                data = [{"ID": id_hex, "Text": text} for id_hex, text in sorted(texts.items())]
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-                print(f"   💾 Saved: {output_file}\n")
+            run_file = os.path.join(cache_dir, f"{lang_key}.jsonl")
+            output_filename = f"{lang_key}.json"
+            output_file = os.path.join(args.output_dir, output_filename)
+            old_entry = manifest['languages'].get(lang_key)
+            
+            if (old_entry and os.path.exists(run_file) and os.path.exists(output_file)
+                    and same_file(old_entry['main'], main_file)
+                    and same_file(old_entry['diff'], diff_file if os.path.exists(diff_file) else None)):
+                print(f"   ⏭️  {lang_code} unchanged, skipping\n")
+            else:
+                texts, entry = extract_language_incremental(
+                    lang_code, main_file, cache_dir,
+                    diff_file=diff_file if os.path.exists(diff_file) else None,
+                    old_entry=old_entry
+                )
+                if not texts:
+                    manifest['languages'].pop(lang_key, None)
+                    continue
+                write_sorted_run(texts, run_file)
+                texts = None
+                entry['run_sha256'] = hash_file(run_file)
+                manifest['languages'][lang_key] = entry
+                
+                if old_entry and old_entry.get('run_sha256') == entry['run_sha256'] and os.path.exists(output_file):
+                    print(f"   ✅ Texts unchanged: {output_file}\n")
+                else:
+                    # Save individual language file
+                    write_json_array(output_file, ({"ID": id_hex, "Text": text} for id_hex, text in iter_run(run_file)))
+                    print(f"   💾 Saved: {output_file}\n")
+                    changed = True
+            
+            # Use mapped name if exists, otherwise capitalize the lang_key
+            run_fields.append(field_names.get(lang_key, lang_key.title()))
+            run_files.append(run_file)
         else:
             print(f"   ⚠️  {lang_code} file not found: {main_file}\n")
     
-    # Create combined template
-    print("📝 Creating translation template...")
-    # Collect all IDs from extracted languages
-    all_ids = set()
-    for texts in extracted_texts.values():
-        all_ids.update(texts.keys())
-    
-    # Build template with all languages
-    # Field name mapping (default to capitalized lang_code if not specified)
-    field_names = {
-        'en': 'English',
-        'cn': 'Chinese',
-        'ko': 'Korean',
-        'ja': 'Japanese',
-        'vi': 'Vietnamese',
-        'de': 'German',
-        'fr': 'French',
-        'es': 'Spanish',
-        'tw': 'Chinese_Traditional'
-    }
-    
+    # Create combined template (only if a language or the column list changed)
     template_file = os.path.join(args.output_dir, "translation_template.json")
-    data = []
-    for id_hex in sorted(all_ids):
-        entry = {"ID": id_hex}
-        
-        # Add all extracted languages
-        for lang_key, texts in extracted_texts.items():
-            # Use mapped name if exists, otherwise capitalize the lang_key
-            field_name = field_names.get(lang_key, lang_key.title())
-            entry[field_name] = texts.get(id_hex, '')
-        
-        # Add Target column (empty by default, to be filled by translators)
-        entry["Target"] = ''
-        
-        data.append(entry)
+    if changed or manifest.get('template') != run_fields or not os.path.exists(template_file):
+        print("📝 Creating translation template...")
+        total = write_json_array(template_file, merge_runs(run_fields, run_files))
+        manifest['template'] = run_fields
+        print(f"   💾 Saved: {template_file}")
+        print(f"   ✅ Total entries: {total:,}")
+    else:
+        print(f"📝 Translation template unchanged: {template_file}")
     
-    with open(template_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
     
-    print(f"   💾 Saved: {template_file}")
-    print(f"   ✅ Total entries: {len(all_ids):,}")
+    if args.build_index:
+        index_file = os.path.splitext(template_file)[0] + '.index'
+        print("🔎 Updating search index...")
+        read_index_stamp(index_file)
+        added, updated, removed = update_search_index(index_file, template_file)
+        print(f"   💾 Saved: {index_file} ({added} added, {updated} updated, {removed} removed)")
     print()
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+"""
+File helpers shared by the extraction and repacking tools.
+Streams JSON array files and hashes files without loading them whole.
+"""
+
+import json
+import re
+import hashlib
+
+def iter_json_array(json_file, chunk_size=1 << 16):
+    """Yield the items of a JSON array file one at a time (constant memory)."""
+    decoder = json.JSONDecoder()
+    skip = re.compile(r'[\s,]*')
+    with open(json_file, 'r', encoding='utf-8') as f:
+        buf = f.read(chunk_size).lstrip()
+        if not buf.startswith('['):
+            raise ValueError(f"{json_file} is not a JSON array")
+        pos = 1
+        while True:
+            pos = skip.match(buf, pos).end()
+            if buf.startswith(']', pos):
+                return
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except ValueError:
+                more = f.read(chunk_size)
+                if not more:
+                    raise
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+            yield item
+
+def write_json_array(output_file, entries):
+    """Stream entries to a JSON array file (same layout as json.dump with indent=2).
+    
+    Returns:
+        Number of entries written
+    """
+    count = 0
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(',\n  ' if count else '[\n  ')
+            # Strings are escaped by json, so every newline here is layout
+            f.write(json.dumps(entry, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+            count += 1
+        f.write('\n]' if count else '[]')
+    return count
+
+def hash_file(path):
+    """SHA-256 of a file, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
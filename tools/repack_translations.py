@@ -12,6 +12,14 @@ import json
 import pyzstd
 import re
 import shutil
+import glob
+import hashlib
+from collections import ChainMap, deque
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape, quoteattr
+
+from file_utils import iter_json_array, write_json_array, hash_file
 
 # Set UTF-8 encoding for Windows
 if sys.platform == 'win32':
@@ -121,7 +129,352 @@ def extract_official_texts(official_dat_dir):
     
     return official_texts
 
-def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill', target_column='Target', autofill_column='English', official_dat_dir=None, diff_output_dir=None):
+def template_format(path):
+    """Template format from the file extension: 'json', 'csv' or 'xliff'."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        return 'csv'
+    if ext in ('.xlf', '.xliff'):
+        return 'xliff'
+    return 'json'
+
+def iter_csv_rows(csv_file):
+    """Yield template rows from a CSV file (header: ID and column names)."""
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            yield {key: value or '' for key, value in row.items() if key}
+
+def iter_xliff_rows(xliff_file):
+    """Yield template rows from an XLIFF 1.2 or 2.0 file, one unit at a time.
+    
+    The source/target elements map to the columns recorded in the file header on
+    export (default: English/Target); notes map to the other columns.
+    """
+    source_column = 'English'
+    target_column = 'Target'
+    columns = None
+    stack = []
+    for event, elem in ElementTree.iterparse(xliff_file, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+        stack.pop()
+        tag = elem.tag.rsplit('}', 1)[-1]
+        parents = [e.tag.rsplit('}', 1)[-1] for e in stack[-2:]]
+        
+        if tag == 'note' and (parents[-1:] == ['header'] or parents == ['file', 'notes']):
+            # File level notes (XLIFF 1.2 <header>, XLIFF 2.0 <file><notes>) hold the column names
+            key = elem.get('from') or elem.get('category')
+            if key == 'wwm:source-column':
+                source_column = elem.text or source_column
+            elif key == 'wwm:target-column':
+                target_column = elem.text or target_column
+            elif key == 'wwm:columns' and elem.text:
+                columns = elem.text.split(',')
+        elif tag in ('trans-unit', 'unit'):
+            values = {}
+            # Only read the unit's own elements: nested subtrees such as <alt-trans>
+            # (translation memory matches) carry <source>/<target> of their own
+            if tag == 'unit':
+                # XLIFF 2.0: unit/segment, unit/ignorable and unit/notes
+                children = [child for part in elem
+                            if part.tag.rsplit('}', 1)[-1] in ('segment', 'ignorable', 'notes')
+                            for child in part]
+            else:
+                children = list(elem)
+            for child in children:
+                child_tag = child.tag.rsplit('}', 1)[-1]
+                if child_tag == 'source':
+                    values[source_column] = values.get(source_column, '') + ''.join(child.itertext())
+                elif child_tag == 'target':
+                    values[target_column] = values.get(target_column, '') + ''.join(child.itertext())
+                elif child_tag == 'note':
+                    column = child.get('from') or child.get('category')
+                    if column:
+                        values[column] = ''.join(child.itertext())
+            row = {'ID': elem.get('id') or ''}
+            unit_columns = columns or ([source_column] + [c for c in values if c not in (source_column, target_column)]
+                                       + [target_column])
+            for column in unit_columns:
+                row[column] = values.get(column, '')
+            yield row
+            # Drop processed units so memory stays constant
+            if stack:
+                stack[-1].remove(elem)
+
+def iter_template_rows(template_file):
+    """Yield template rows one at a time from a JSON, CSV or XLIFF template."""
+    fmt = template_format(template_file)
+    if fmt == 'csv':
+        return iter_csv_rows(template_file)
+    if fmt == 'xliff':
+        return iter_xliff_rows(template_file)
+    return iter_json_array(template_file)
+
+def load_template(json_file):
+    """Read template rows from the template (JSON, CSV or XLIFF)."""
+    return list(iter_template_rows(json_file))
+
+# Characters not allowed in XML 1.0 (\r is kept as a character reference)
+XML_INVALID_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+def xml_text(text):
+    """Escape text for XML element content."""
+    return escape(XML_INVALID_RE.sub('', text)).replace('\r', '&#13;')
+
+def export_template(template_file, output_file, source_column='English', target_column='Target', source_lang='en', target_lang='vi', xliff_version='1.2'):
+    """Stream template rows to CSV or XLIFF (chosen by the output extension).
+    
+    XLIFF: source_column/target_column become <source>/<target>, the other columns
+    are written as notes so that importing the file restores the full template.
+    
+    Returns:
+        Number of rows written
+    """
+    rows = iter_template_rows(template_file)
+    count = 0
+    
+    if template_format(output_file) == 'csv':
+        with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = None
+            for row in rows:
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(row), extrasaction='ignore', restval='')
+                    writer.writeheader()
+                writer.writerow(row)
+                count += 1
+        return count
+    
+    original = quoteattr(os.path.basename(template_file))
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        columns = None
+        for row in rows:
+            if columns is None:
+                columns = list(row)
+                if 'ID' in columns:
+                    columns.remove('ID')
+                if target_column not in columns:
+                    columns.append(target_column)
+                header_notes = [('wwm:source-column', source_column), ('wwm:target-column', target_column),
+                                ('wwm:columns', ','.join(columns))]
+                if xliff_version == '2.0':
+                    f.write(f'<xliff xmlns="urn:oasis:names:tc:xliff:document:2.0" version="2.0" '
+                            f'srcLang={quoteattr(source_lang)} trgLang={quoteattr(target_lang)}>\n')
+                    f.write(f'  <file id="f1" original={original}>\n    <notes>\n')
+                    for key, value in header_notes:
+                        f.write(f'      <note category={quoteattr(key)}>{xml_text(value)}</note>\n')
+                    f.write('    </notes>\n')
+                else:
+                    f.write('<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">\n')
+                    f.write(f'  <file original={original} source-language={quoteattr(source_lang)} '
+                            f'target-language={quoteattr(target_lang)} datatype="plaintext">\n    <header>\n')
+                    for key, value in header_notes:
+                        f.write(f'      <note from={quoteattr(key)}>{xml_text(value)}</note>\n')
+                    f.write('    </header>\n    <body>\n')
+            
+            unit_id = quoteattr(row.get('ID') or '')
+            source_text = xml_text(row.get(source_column) or '')
+            target_text = xml_text(row.get(target_column) or '')
+            notes = [(column, xml_text(row.get(column) or '')) for column in columns
+                     if column not in (source_column, target_column) and row.get(column)]
+            if xliff_version == '2.0':
+                f.write(f'    <unit id={unit_id} xml:space="preserve">\n')
+                if notes:
+                    f.write('      <notes>\n')
+                    for column, text in notes:
+                        f.write(f'        <note category={quoteattr(column)}>{text}</note>\n')
+                    f.write('      </notes>\n')
+                f.write(f'      <segment>\n        <source>{source_text}</source>\n')
+                if target_text:
+                    f.write(f'        <target>{target_text}</target>\n')
+                f.write('      </segment>\n    </unit>\n')
+            else:
+                f.write(f'      <trans-unit id={unit_id} xml:space="preserve">\n')
+                f.write(f'        <source>{source_text}</source>\n')
+                if target_text:
+                    f.write(f'        <target>{target_text}</target>\n')
+                for column, text in notes:
+                    f.write(f'        <note from={quoteattr(column)}>{text}</note>\n')
+                f.write('      </trans-unit>\n')
+            count += 1
+        
+        if columns is None:
+            # Empty template: still write a valid document
+            if xliff_version == '2.0':
+                f.write(f'<xliff xmlns="urn:oasis:names:tc:xliff:document:2.0" version="2.0" '
+                        f'srcLang={quoteattr(source_lang)} trgLang={quoteattr(target_lang)}>\n'
+                        f'  <file id="f1" original={original}>\n')
+            else:
+                f.write('<xliff version="1.2" xmlns="urn:oasis:names:tc:xliff:document:1.2">\n')
+                f.write(f'  <file original={original} source-language={quoteattr(source_lang)} '
+                        f'target-language={quoteattr(target_lang)} datatype="plaintext">\n    <body>\n')
+        if xliff_version == '2.0':
+            f.write('  </file>\n</xliff>\n')
+        else:
+            f.write('    </body>\n  </file>\n</xliff>\n')
+    
+    return count
+
+def import_template(input_file, output_file):
+    """Stream a CSV or XLIFF file back to a JSON template.
+    
+    Returns:
+        Number of rows written
+    """
+    return write_json_array(output_file, iter_template_rows(input_file))
+
+def load_translations(json_file, mode='autofill', target_column='Target', autofill_column='English', rows=None):
+    """Read translations from the JSON template.
+    
+    Args:
+        json_file: Translation template (JSON, CSV or XLIFF), streamed row by row
+        rows: Already loaded template rows (json_file is not read again)
+    
+    Returns:
+        (translations, target_count, autofill_count) where translations is {id: text}
+    """
+    translations = {}
+    target_count = 0
+    autofill_count = 0
+    
+    if rows is None:
+        rows = iter_template_rows(json_file)
+    for row in rows:
+        id_hex = (row.get('ID') or '').strip()
+        if not id_hex:
+            continue
+        target_text = (row.get(target_column) or '').strip()
+        autofill_text = (row.get(autofill_column) or '').strip()
+        
+        if mode == 'target':
+            # Use only target column (skip if empty)
+            if target_text:
+                translations[id_hex] = target_text
+                target_count += 1
+        else:  # autofill
+            # Use target if available, otherwise use autofill
+            if target_text:
+                translations[id_hex] = target_text
+                target_count += 1
+            elif autofill_text:
+                translations[id_hex] = autofill_text
+                autofill_count += 1
+    
+    return translations, target_count, autofill_count
+
+def load_glossary(glossary_file):
+    """Read glossary CSV (columns: term, translation).
+    
+    A translation may list several approved alternatives separated by '|'.
+    
+    Returns:
+        List of (term, [approved translations])
+    """
+    glossary = []
+    with open(glossary_file, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            term = (row.get('term') or '').strip()
+            translations = [t.strip() for t in (row.get('translation') or '').split('|') if t.strip()]
+            if term and translations:
+                glossary.append((term, translations))
+    return glossary
+
+def build_automaton(terms):
+    """Build an Aho-Corasick automaton over lowercased terms.
+    
+    Returns:
+        (goto, fail, output): goto[state] maps a character to the next state,
+        fail[state] is the fallback state and output[state] lists (term index, term length)
+        for every term ending in that state
+    """
+    goto = [{}]
+    output = [[]]
+    for index, term in enumerate(terms):
+        state = 0
+        term = term.lower()
+        for ch in term:
+            next_state = goto[state].get(ch)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][ch] = next_state
+                goto.append({})
+                output.append([])
+            state = next_state
+        output[state].append((index, len(term)))
+    
+    # Breadth-first: fail links of a state only depend on shallower states
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for ch, next_state in goto[state].items():
+            queue.append(next_state)
+            f = fail[state]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            fail[next_state] = goto[f].get(ch, 0)
+            output[next_state] = output[next_state] + output[fail[next_state]]
+    
+    return goto, fail, output
+
+def is_word_char(ch):
+    """Letters/digits of space-separated scripts (CJK text has no word boundaries)."""
+    return ch.isalnum() and ord(ch) < 0x2E80
+
+def find_terms(text, automaton):
+    """Return indices of all terms found in text (single pass over the text).
+    
+    Terms starting/ending with a letter only match on word boundaries, so "Sect" does not
+    match "Section".
+    """
+    goto, fail, output = automaton
+    text = text.lower()
+    found = set()
+    state = 0
+    for pos, ch in enumerate(text):
+        while state and ch not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(ch, 0)
+        for index, length in output[state]:
+            start = pos - length + 1
+            if is_word_char(text[start]) and start > 0 and is_word_char(text[start - 1]):
+                continue
+            if is_word_char(ch) and pos + 1 < len(text) and is_word_char(text[pos + 1]):
+                continue
+            found.add(index)
+    return found
+
+def check_glossary(rows, glossary, source_column='English', target_column='Target'):
+    """Check that every translated row uses the approved translation of each glossary term.
+    
+    Only rows with a non-empty target are checked.
+    
+    Returns:
+        List of (id, term, [approved translations]) violations
+    """
+    automaton = build_automaton([term for term, _ in glossary])
+    violations = []
+    for row in rows:
+        target_text = (row.get(target_column) or '').strip()
+        source_text = row.get(source_column) or ''
+        if not target_text or not source_text:
+            continue
+        target_lower = target_text.lower()
+        for index in sorted(find_terms(source_text, automaton)):
+            term, translations = glossary[index]
+            if not any(t.lower() in target_lower for t in translations):
+                violations.append((row.get('ID') or '', term, translations))
+    return violations
+
+def print_glossary_violations(violations, target_column, limit=50):
+    """Print glossary violations (at most limit lines)."""
+    for id_hex, term, translations in violations[:limit]:
+        print(f"   ❌ {id_hex}: '{term}' must be translated as {' | '.join(translations)} in {target_column}")
+    if len(violations) > limit:
+        print(f"   ... and {len(violations) - limit} more")
+
+def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill', target_column='Target', autofill_column='English', official_dat_dir=None, diff_output_dir=None, rows=None, official_texts=None, source_cache=None, dedup_texts=False, only_files=None):
     """Pack text from JSON to .dat files.
     
     Args:
@@ -132,34 +485,15 @@ def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill',
         autofill_column: Column name to use for autofill when target is empty (default: 'English')
         official_dat_dir: Directory containing official .dat files (for diff comparison)
         diff_output_dir: Output directory for diff .dat files (only changed entries)
+        rows: Already loaded template rows (shared when packing several targets)
+        official_texts: Already extracted official texts (skips official_dat_dir)
+        source_cache: Dict filled with parsed source .dat entries (id, text tuples) and reused on later calls
+        dedup_texts: Store identical texts once per block (entries share the offset)
+        only_files: Only build these source .dat files (used for sharded repack)
     """
     # Read translations from JSON
-    translations = {}
-    target_count = 0
-    autofill_count = 0
-    
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        for row in data:
-            id_hex = (row.get('ID') or '').strip()
-            if not id_hex:
-                continue
-            target_text = (row.get(target_column) or '').strip()
-            autofill_text = (row.get(autofill_column) or '').strip()
-            
-            if mode == 'target':
-                # Use only target column (skip if empty)
-                if target_text:
-                    translations[id_hex] = target_text
-                    target_count += 1
-            else:  # autofill
-                # Use target if available, otherwise use autofill
-                if target_text:
-                    translations[id_hex] = target_text
-                    target_count += 1
-                elif autofill_text:
-                    translations[id_hex] = autofill_text
-                    autofill_count += 1
+    translations, target_count, autofill_count = load_translations(
+        json_file, mode=mode, target_column=target_column, autofill_column=autofill_column, rows=rows)
     
     print(f"📝 Loaded {len(translations)} translations")
     if mode == 'autofill':
@@ -173,11 +507,12 @@ def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill',
         return False
     
     # Extract official texts for diff comparison
-    official_texts = {}
-    if official_dat_dir and os.path.exists(official_dat_dir):
-        print("📋 Extracting official texts for diff comparison...")
-        official_texts = extract_official_texts(official_dat_dir)
-        print(f"   ✅ Found {len(official_texts)} official texts")
+    if official_texts is None:
+        official_texts = {}
+        if official_dat_dir and os.path.exists(official_dat_dir):
+            print("📋 Extracting official texts for diff comparison...")
+            official_texts = extract_official_texts(official_dat_dir)
+            print(f"   ✅ Found {len(official_texts)} official texts")
     
     # Calculate diff (only entries that differ from official)
     diff_translations = {}
@@ -197,45 +532,48 @@ def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill',
     for filename in os.listdir(source_dat_dir):
         if not filename.endswith('.dat'):
             continue
+        if only_files is not None and filename not in only_files:
+            continue
         
         input_path = os.path.join(source_dat_dir, filename)
         output_path = os.path.join(output_dat_dir, filename)
         
         try:
             with open(input_path, 'rb') as f:
-                # Check for marker first
-                f.seek(16)
-                if f.read(4) != b'\xDC\x96\x58\x59':
+                if source_cache is not None and filename in source_cache:
+                    count_full, count_text, code, entries = source_cache[filename]
+                else:
+                    # Check for marker first
+                    f.seek(16)
+                    if f.read(4) != b'\xDC\x96\x58\x59':
+                        f.seek(0)
+                        with open(output_path, 'wb') as out_f:
+                            out_f.write(f.read())
+                        continue
+                    
+                    # Read structure (matching Russian code exactly)
                     f.seek(0)
-                    with open(output_path, 'wb') as out_f:
-                        out_f.write(f.read())
-                    continue
-                
-                # Read structure (matching Russian code exactly)
-                f.seek(0)
-                count_full = struct.unpack('<I', f.read(4))[0]
-                f.read(4)
-                count_text = struct.unpack('<I', f.read(4))[0]
-                f.read(12)  # padding + marker + padding (12 bytes total, brings us to position 24)
-                code = f.read(count_full).hex()  # Read code block from position 24
-                f.read(17)  # Padding
-                data_start = f.tell()
-                
-                entries = []
-                for i in range(count_full):
-                    f.seek(data_start + (i * 16))
-                    id_hex = f.read(8).hex()
-                    start_text_offset = f.tell()
-                    offset_text = struct.unpack('<I', f.read(4))[0]
-                    lenght = struct.unpack('<I', f.read(4))[0]
-                    f.seek(start_text_offset + offset_text)
-                    original_text = f.read(lenght).decode('utf-8', errors='ignore')
-                    entries.append({
-                        'id': id_hex,
-                        'offset': offset_text,
-                        'length': lenght,
-                        'text': original_text
-                    })
+                    count_full = struct.unpack('<I', f.read(4))[0]
+                    f.read(4)
+                    count_text = struct.unpack('<I', f.read(4))[0]
+                    f.read(12)  # padding + marker + padding (12 bytes total, brings us to position 24)
+                    code = f.read(count_full).hex()  # Read code block from position 24
+                    f.read(17)  # Padding
+                    data_start = f.tell()
+                    
+                    entries = []
+                    for i in range(count_full):
+                        f.seek(data_start + (i * 16))
+                        id_hex = f.read(8).hex()
+                        start_text_offset = f.tell()
+                        offset_text = struct.unpack('<I', f.read(4))[0]
+                        lenght = struct.unpack('<I', f.read(4))[0]
+                        f.seek(start_text_offset + offset_text)
+                        original_text = f.read(lenght).decode('utf-8', errors='ignore')
+                        entries.append((id_hex, original_text))
+                    
+                    if source_cache is not None:
+                        source_cache[filename] = (count_full, count_text, code, entries)
                 
                 # Build new file (following Russian code logic)
                 # Structure:
@@ -265,16 +603,18 @@ def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill',
                 # Track current position in ID section (like Russian code does)
                 current_start_id = start_id
                 
-                for i, entry in enumerate(entries):
-                    id_hex = entry['id']
-                    
+                # Position of each text already written (dedup_texts only)
+                text_positions = {}
+                
+                for i, (id_hex, source_text) in enumerate(entries):
                     if id_hex in translations:
                         # JSON already has unescaped text, no need to unescape
                         text = translations[id_hex]
                     else:
-                        text = entry['text']
+                        text = source_text
                     
                     text_bytes = text.encode('utf-8')
+                    text_pos = text_positions.get(text_bytes) if dedup_texts else None
                     
                     unk_byte = bytes.fromhex(code[i*2:(i+1)*2])
                     filled_bytes_unk += unk_byte
@@ -285,12 +625,15 @@ def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill',
                     
                     # Offset is relative to current_start_id (where offset field is stored)
                     # This matches Russian code: offset = curr_text - start_id (where start_id is updated)
-                    offset_len = struct.pack('<II', (curr_text - current_start_id), len(text_bytes))
+                    if text_pos is None:
+                        text_pos = curr_text
+                        filled_bytes_text += text_bytes
+                        curr_text += len(text_bytes)
+                        if dedup_texts:
+                            text_positions[text_bytes] = text_pos
+                    offset_len = struct.pack('<II', (text_pos - current_start_id), len(text_bytes))
                     filled_bytes_id += offset_len
                     current_start_id += 8  # After writing offset+length (8 bytes)
-                    
-                    filled_bytes_text += text_bytes
-                    curr_text += len(text_bytes)
                 
                 # Pad code block to exactly count_full bytes
                 if len(filled_bytes_unk) < count_full:
@@ -316,8 +659,7 @@ def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill',
                 if diff_output_dir and diff_translations:
                     diff_entries = []
                     diff_ids = set()
-                    for entry in entries:
-                        id_hex = entry['id']
+                    for id_hex, _ in entries:
                         if id_hex in diff_translations:
                             diff_entries.append({
                                 'id': id_hex,
@@ -342,14 +684,16 @@ def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill',
                         
                         # Track current position in ID section (like main packing logic)
                         diff_current_start_id = diff_start_id
+                        diff_text_positions = {}
                         
                         for i, entry in enumerate(diff_entries):
                             id_hex = entry['id']
                             text = entry['text']
                             text_bytes = text.encode('utf-8')
+                            text_pos = diff_text_positions.get(text_bytes) if dedup_texts else None
                             
                             # Find original code byte
-                            orig_idx = next((j for j, e in enumerate(entries) if e['id'] == id_hex), 0)
+                            orig_idx = next((j for j, (e_id, _) in enumerate(entries) if e_id == id_hex), 0)
                             unk_byte = bytes.fromhex(code[orig_idx*2:(orig_idx+1)*2])
                             diff_filled_bytes_unk += unk_byte
                             
@@ -358,12 +702,15 @@ def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill',
                             diff_current_start_id += 8  # After writing ID (8 bytes)
                             
                             # Offset is relative to diff_current_start_id (where offset field is stored)
-                            offset_len = struct.pack('<II', (diff_curr_text - diff_current_start_id), len(text_bytes))
+                            if text_pos is None:
+                                text_pos = diff_curr_text
+                                diff_filled_bytes_text += text_bytes
+                                diff_curr_text += len(text_bytes)
+                                if dedup_texts:
+                                    diff_text_positions[text_bytes] = text_pos
+                            offset_len = struct.pack('<II', (text_pos - diff_current_start_id), len(text_bytes))
                             diff_filled_bytes_id += offset_len
                             diff_current_start_id += 8  # After writing offset+length (8 bytes)
-                            
-                            diff_filled_bytes_text += text_bytes
-                            diff_curr_text += len(text_bytes)
                         
                         if len(diff_filled_bytes_unk) < diff_count:
                             diff_filled_bytes_unk += b'\x00' * (diff_count - len(diff_filled_bytes_unk))
@@ -388,8 +735,58 @@ def pack_text_to_dat(json_file, source_dat_dir, output_dat_dir, mode='autofill',
     
     return True
 
-def pack_dat_to_binary(dat_dir, output_file):
-    """Pack .dat files back to binary."""
+def read_dat_table(data):
+    """Decode the ID/text table of a .dat block held in memory.
+    
+    Returns:
+        (entries, errors) where entries is a list of (id_bytes, text_bytes) in table
+        order and errors lists truncated tables and offsets pointing outside the text section
+    """
+    entries = []
+    errors = []
+    count_full = struct.unpack_from('<I', data, 0)[0]
+    data_start = 24 + count_full + 17
+    text_start = data_start + count_full * 16
+    if text_start > len(data):
+        errors.append(f"truncated ID table ({count_full} entries, {len(data)} bytes)")
+    
+    for i in range(count_full):
+        pos = data_start + (i * 16)
+        if pos + 16 > len(data):
+            break
+        id_bytes = data[pos:pos + 8]
+        offset_text, lenght = struct.unpack_from('<II', data, pos + 8)
+        # offset_text is relative to where it is stored (right after the ID)
+        text_pos = pos + 8 + offset_text
+        if text_pos < text_start or text_pos + lenght > len(data):
+            errors.append(f"{id_bytes.hex()}: bad offset {offset_text} (length {lenght})")
+            continue
+        entries.append((id_bytes, data[text_pos:text_pos + lenght]))
+    
+    return entries, errors
+
+def hash_dat_table(data):
+    """Hash the decoded ID/text table of a .dat block.
+    
+    The hash covers IDs, lengths and texts in table order, not the layout of the
+    text section. Blocks without the text marker are hashed as raw bytes.
+    
+    Returns:
+        (hex digest, entry count, errors)
+    """
+    if len(data) < 20 or data[16:20] != b'\xDC\x96\x58\x59':
+        return hashlib.sha256(data).hexdigest(), 0, []
+    
+    entries, errors = read_dat_table(data)
+    h = hashlib.sha256()
+    for id_bytes, text_bytes in entries:
+        h.update(id_bytes)
+        h.update(struct.pack('<I', len(text_bytes)))
+        h.update(text_bytes)
+    return h.hexdigest(), len(entries), errors
+
+def sorted_dat_files(dat_dir):
+    """List .dat files in block order (by the number at the end of the name)."""
     files = [f for f in os.listdir(dat_dir) if f.endswith('.dat')]
     
     def extract_number(filename):
@@ -397,54 +794,663 @@ def pack_dat_to_binary(dat_dir, output_file):
         return int(match.group(1)) if match else float('inf')
     
     files.sort(key=extract_number)
+    return files
+
+def compress_dat_files(dat_dir, files, compress_cache=None):
+    """Compress .dat files into binary blocks.
     
+    Args:
+        compress_cache: Mapping {sha256 of .dat bytes: compressed bytes}, filled and reused
+            so identical blocks (e.g. across several targets) are compressed only once
+    
+    Returns:
+        List of (record, block): block is the 9-byte header + compressed data, record is
+        the block's entry (name, size, entries, sha256) for the verify manifest
+    """
+    packed = []
+    for filename in files:
+        file_path = os.path.join(dat_dir, filename)
+        file_size = os.path.getsize(file_path)
+        
+        with open(file_path, 'rb') as infile:
+            dat_data = infile.read()
+        if compress_cache is not None:
+            dat_key = hashlib.sha256(dat_data).digest()
+            comp_data = compress_cache.get(dat_key)
+            if comp_data is None:
+                comp_data = pyzstd.compress(dat_data)
+            # Stored again on a hit too, so a ChainMap keeps it in its newest map
+            compress_cache[dat_key] = comp_data
+        else:
+            comp_data = pyzstd.compress(dat_data)
+        header = struct.pack('<BII', 4, len(comp_data), file_size)
+        
+        digest, entry_count, _ = hash_dat_table(dat_data)
+        record = {'name': filename, 'size': file_size, 'entries': entry_count, 'sha256': digest}
+        packed.append((record, header + comp_data))
+    
+    return packed
+
+def write_binary(output_file, blocks):
+    """Write compressed blocks to a binary file (magic, version, offset table, data)."""
     with open(output_file, 'wb') as outfile:
         outfile.write(b'\xEF\xBE\xAD\xDE\x01\x00\x00\x00')
-        count_files = struct.pack('<I', len(files))
+        count_files = struct.pack('<I', len(blocks))
         outfile.write(count_files)
-        archive = b''
         
-        for filename in files:
-            file_path = os.path.join(dat_dir, filename)
-            file_size = os.path.getsize(file_path)
-            
-            with open(file_path, 'rb') as infile:
-                comp_data = pyzstd.compress(infile.read())
-                header = struct.pack('<BII', 4, len(comp_data), file_size)
-                len_arch = struct.pack('<I', len(archive))
-                outfile.write(len_arch)
-                archive += header + comp_data
+        len_arch = 0
+        for block in blocks:
+            outfile.write(struct.pack('<I', len_arch))
+            len_arch += len(block)
+        outfile.write(struct.pack('<I', len_arch))
         
-        len_arch = struct.pack('<I', len(archive))
-        outfile.write(len_arch)
-        outfile.write(archive)
+        for block in blocks:
+            outfile.write(block)
+
+def pack_dat_to_binary(dat_dir, output_file, compress_cache=None):
+    """Pack .dat files back to binary.
+    
+    Args:
+        compress_cache: Mapping {sha256 of .dat bytes: compressed bytes}, filled and reused
+            so identical blocks (e.g. across several targets) are compressed only once
+    
+    Returns:
+        List of per-block records (name, size, entries, sha256) for the verify manifest
+    """
+    packed = compress_dat_files(dat_dir, sorted_dat_files(dat_dir), compress_cache=compress_cache)
+    write_binary(output_file, [block for _, block in packed])
+    return [record for record, _ in packed]
+
+def write_verify_manifest(manifest_file, blocks, template_file=None, template_sha256=None):
+    """Write expected block hashes computed during packing (used by the verify command)."""
+    if template_file and not template_sha256:
+        template_sha256 = hash_file(template_file)
+    manifest = {
+        'version': 1,
+        'template_sha256': template_sha256,
+        'blocks': blocks
+    }
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+# Template translations shared with verify worker processes (see init_verify_worker)
+verify_translations = None
+
+def init_verify_worker(translations):
+    """Give a verify worker process the template translations ({id: text})."""
+    global verify_translations
+    verify_translations = translations
+
+def decompress_block(comp_block):
+    """Decompress one binary block (9-byte header + zstd data).
+    
+    Returns:
+        (data, problems) where data is None if the block cannot be decoded
+    """
+    if len(comp_block) < 9:
+        return None, [f"truncated block ({len(comp_block)} bytes, header needs 9)"]
+    
+    problems = []
+    comp_type, comp_size, decomp_size = struct.unpack('<BII', comp_block[:9])
+    if comp_type != 0x04:
+        return None, [f"unexpected compression type {comp_type}"]
+    if comp_size != len(comp_block) - 9:
+        problems.append(f"truncated block (header says {comp_size} bytes, offsets give {len(comp_block) - 9})")
+    
+    try:
+        data = pyzstd.decompress(comp_block[9:])
+    except Exception as e:
+        return None, problems + [f"cannot decompress: {e}"]
+    
+    if len(data) != decomp_size:
+        problems.append(f"truncated block (decoded {len(data)} bytes, header says {decomp_size})")
+    return data, problems
+
+def expected_dat_table(source_data, translations):
+    """Build the ID/text table a repacked block should hold: the template text, else the source text.
+    
+    Returns:
+        List of (id_bytes, text_bytes) in table order
+    """
+    entries = []
+    for id_bytes, text_bytes in read_dat_table(source_data)[0]:
+        id_hex = id_bytes.hex()
+        if id_hex in translations:
+            text_bytes = translations[id_hex].encode('utf-8')
+        else:
+            # pack_text_to_dat decodes source texts leniently before writing them back
+            text_bytes = text_bytes.decode('utf-8', errors='ignore').encode('utf-8')
+        entries.append((id_bytes, text_bytes))
+    return entries
+
+def verify_block(task):
+    """Decode one compressed block and check it (runs in a worker process).
+    
+    The table hash is compared with the manifest record. With a source block and the
+    template translations (init_verify_worker), the decoded table is also compared
+    entry by entry with the table rebuilt from them.
+    
+    Args:
+        task: (index, comp_block, expected block record or None, source comp_block or None)
+    
+    Returns:
+        (index, problems)
+    """
+    index, comp_block, expected, source_block = task
+    
+    data, problems = decompress_block(comp_block)
+    if data is None:
+        return index, problems
+    
+    digest, entry_count, errors = hash_dat_table(data)
+    problems.extend(errors)
+    if expected and digest != expected['sha256']:
+        problems.append(f"table hash mismatch ({entry_count} entries, expected {expected['entries']})")
+    
+    if source_block is None or verify_translations is None:
+        return index, problems
+    source_data, source_problems = decompress_block(source_block)
+    if source_data is None:
+        return index, problems + [f"source block: {problem}" for problem in source_problems]
+    
+    if source_data[16:20] != b'\xDC\x96\x58\x59':
+        # Blocks without texts are copied from the source unchanged
+        if data != source_data:
+            problems.append("differs from the source block (no text table)")
+        return index, problems
+    
+    entries = read_dat_table(data)[0] if data[16:20] == b'\xDC\x96\x58\x59' else []
+    expected_entries = expected_dat_table(source_data, verify_translations)
+    if len(entries) != len(expected_entries):
+        problems.append(f"{len(entries)} entries, template/source give {len(expected_entries)}")
+    for (id_bytes, text_bytes), (expected_id, expected_text) in zip(entries, expected_entries):
+        if id_bytes != expected_id:
+            problems.append(f"ID {id_bytes.hex()} where the source has {expected_id.hex()}")
+        elif text_bytes != expected_text:
+            problems.append(f"mismatched ID {id_bytes.hex()}")
+    
+    return index, problems
+
+def read_binary_blocks(binary_file):
+    """Read the offset table and compressed blocks of a binary file.
+    
+    Returns:
+        (blocks, problems) where blocks is a list of compressed block bytes
+    """
+    problems = []
+    with open(binary_file, 'rb') as f:
+        content = f.read()
+    
+    if content[:4] != b'\xEF\xBE\xAD\xDE':
+        return [], ["bad magic (not a packed language file)"]
+    if len(content) < 16:
+        return [], ["truncated header"]
+    
+    offset_count = struct.unpack_from('<I', content, 8)[0] + 1
+    data_start = 12 + offset_count * 4
+    if data_start > len(content):
+        return [], [f"truncated offset table ({offset_count} offsets)"]
+    offsets = list(struct.unpack_from(f'<{offset_count}I', content, 12))
+    archive_len = len(content) - data_start
+    
+    if offset_count == 1:
+        # Single block layout: the only value is the block length
+        offsets = [0, offsets[0]]
+    if offsets[0] != 0:
+        problems.append(f"bad offset: first block starts at {offsets[0]}, expected 0")
+    if offsets[-1] != archive_len:
+        problems.append(f"bad offset: offset table ends at {offsets[-1]}, data is {archive_len} bytes")
+    
+    blocks = []
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        if end < start or end > archive_len:
+            problems.append(f"block {i}: bad offset range {start}..{end} (data is {archive_len} bytes)")
+            blocks.append(content[data_start + start:data_start + min(max(start, end), archive_len)])
+            continue
+        blocks.append(content[data_start + start:data_start + end])
+    
+    return blocks, problems
+
+def verify_binary(binary_file, manifest_file=None, template_file=None, source_binary=None, mode='autofill', target_column='Target', autofill_column='English', jobs=None):
+    """Verify a packed binary against its manifest and/or the template.
+    
+    Two references are used, each when available:
+        - manifest_file: table hashes recorded by pack_dat_to_binary and the template hash
+        - template_file + source_binary: every block's ID/text table is rebuilt from the
+          source entries and the template translations and compared entry by entry
+    
+    Blocks are decoded in parallel. Table hashes ignore the text layout, so binaries
+    packed with dedup_texts check against the same references.
+    
+    Returns:
+        List of problems found (empty means the binary is good)
+    """
+    expected_blocks = None
+    problems = []
+    if manifest_file:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        expected_blocks = manifest['blocks']
+        if template_file and manifest.get('template_sha256') and hash_file(template_file) != manifest['template_sha256']:
+            problems.append(f"template changed since packing: {template_file}")
+    
+    blocks, binary_problems = read_binary_blocks(binary_file)
+    problems.extend(binary_problems)
+    if expected_blocks is not None and len(blocks) != len(expected_blocks):
+        problems.append(f"block count {len(blocks)} != packed block count {len(expected_blocks)}")
+    
+    translations = None
+    source_blocks = []
+    if template_file and source_binary:
+        translations = load_translations(template_file, mode=mode, target_column=target_column,
+                                         autofill_column=autofill_column)[0]
+        source_blocks, source_problems = read_binary_blocks(source_binary)
+        problems.extend(f"source binary: {problem}" for problem in source_problems)
+        if len(blocks) != len(source_blocks):
+            problems.append(f"block count {len(blocks)} != source block count {len(source_blocks)}")
+    
+    tasks = [(i, block,
+              expected_blocks[i] if expected_blocks is not None and i < len(expected_blocks) else None,
+              source_blocks[i] if i < len(source_blocks) else None)
+             for i, block in enumerate(blocks)]
+    if jobs == 1 or len(tasks) < 2:
+        init_verify_worker(translations)
+        results = [verify_block(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_verify_worker,
+                                 initargs=(translations,)) as executor:
+            results = list(executor.map(verify_block, tasks, chunksize=max(1, len(tasks) // 64)))
+    
+    for index, block_problems in sorted(results, key=lambda r: r[0]):
+        if expected_blocks is not None and index < len(expected_blocks):
+            name = expected_blocks[index]['name']
+        else:
+            name = f"#{index}"
+        for problem in block_problems:
+            problems.append(f"block {index} ({name}): {problem}")
+    
+    return problems
+
+def write_shard(shard_file, shard_index, shard_count, total_blocks, main_packed, diff_packed, template_sha256=None, settings=None):
+    """Write a shard artifact: the compressed blocks of one block range and their records.
+    
+    Layout: b'WWMSHARD', header length (4 bytes), JSON header, main blocks, diff blocks.
+    
+    Args:
+        settings: Options of the sharded run that change its output (binaries, output diff,
+            mode, columns, dedup); merge refuses shards whose settings differ
+    """
+    header = {
+        'version': 2,
+        'shard': shard_index,
+        'shards': shard_count,
+        'total_blocks': total_blocks,
+        'template_sha256': template_sha256,
+        'settings': settings or {},
+        'main': [dict(record, length=len(block)) for record, block in main_packed],
+        'diff': [dict(record, length=len(block)) for record, block in diff_packed]
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    with open(shard_file, 'wb') as f:
+        f.write(b'WWMSHARD')
+        f.write(struct.pack('<I', len(header_bytes)))
+        f.write(header_bytes)
+        for _, block in main_packed + diff_packed:
+            f.write(block)
+
+def read_shard(shard_file):
+    """Read a shard artifact.
+    
+    Returns:
+        (header, main_blocks, diff_blocks)
+    """
+    with open(shard_file, 'rb') as f:
+        if f.read(8) != b'WWMSHARD':
+            raise ValueError(f"{shard_file} is not a shard artifact")
+        header_len = struct.unpack('<I', f.read(4))[0]
+        header = json.loads(f.read(header_len).decode('utf-8'))
+        main_blocks = [f.read(record['length']) for record in header['main']]
+        diff_blocks = [f.read(record['length']) for record in header['diff']]
+    
+    records = header['main'] + header['diff']
+    if any(len(block) != record['length'] for block, record in zip(main_blocks + diff_blocks, records)):
+        raise ValueError(f"{shard_file} is truncated")
+    return header, main_blocks, diff_blocks
+
+def merge_shards(shard_files, output_binary, diff_output_binary=None, official_binary=None):
+    """Assemble the final binary (and diff) from shard artifacts, in block order.
+    
+    Args:
+        diff_output_binary: Output diff binary (default: the one recorded by the sharded runs)
+        official_binary: Official binary whose _diff is copied (default: the one recorded by the sharded runs)
+    
+    Returns:
+        True on success
+    """
+    shards = {}
+    for shard_file in shard_files:
+        header, main_blocks, diff_blocks = read_shard(shard_file)
+        if header['shard'] in shards:
+            print(f"❌ Shard {header['shard']} given twice: {shard_file}")
+            return False
+        shards[header['shard']] = (shard_file, header, main_blocks, diff_blocks)
+    
+    if not shards:
+        print("❌ No shard artifacts found")
+        return False
+    headers = [header for _, header, _, _ in shards.values()]
+    shard_count = headers[0]['shards']
+    if any(h['shards'] != shard_count or h['total_blocks'] != headers[0]['total_blocks'] for h in headers):
+        print("❌ Shards come from different runs (shard count or block count differ)")
+        return False
+    if len(set(h['template_sha256'] for h in headers)) > 1:
+        print("❌ Shards were built from different templates")
+        return False
+    settings = headers[0].get('settings', {})
+    differing = sorted(set(key for h in headers for key in set(settings) | set(h.get('settings', {}))
+                           if h.get('settings', {}).get(key) != settings.get(key)))
+    if differing:
+        print(f"❌ Shards were built with different settings: {', '.join(differing)}")
+        return False
+    
+    # The diff must match what a single run with the same options would write
+    recorded_diff = settings.get('output_diff') or os.path.splitext(output_binary)[0] + '_diff'
+    recorded_official = settings.get('official_binary') or 'language/source/translate_words_map_zh_cn'
+    diff_output_binary = diff_output_binary or recorded_diff
+    official_binary = official_binary or recorded_official
+    if os.path.normpath(diff_output_binary) != os.path.normpath(recorded_diff):
+        print(f"❌ Shards were built with --output-diff {recorded_diff}, not {diff_output_binary}")
+        return False
+    if os.path.normpath(official_binary) != os.path.normpath(recorded_official):
+        print(f"❌ Shards were built with --official-binary {recorded_official}, not {official_binary}")
+        return False
+    missing = sorted(set(range(1, shard_count + 1)) - set(shards))
+    if missing:
+        print(f"❌ Missing shard(s): {', '.join(str(i) for i in missing)} of {shard_count}")
+        return False
+    
+    records = []
+    main_blocks = []
+    diff_blocks = []
+    for shard_index in range(1, shard_count + 1):
+        _, header, shard_main, shard_diff = shards[shard_index]
+        records.extend({k: v for k, v in record.items() if k != 'length'} for record in header['main'])
+        main_blocks.extend(shard_main)
+        diff_blocks.extend(shard_diff)
+    
+    if len(main_blocks) != headers[0]['total_blocks']:
+        print(f"❌ Shards contain {len(main_blocks)} blocks, expected {headers[0]['total_blocks']}")
+        return False
+    
+    print(f"📦 Writing {len(main_blocks)} blocks from {shard_count} shard(s)...")
+    os.makedirs(os.path.dirname(output_binary) or '.', exist_ok=True)
+    os.makedirs(os.path.dirname(diff_output_binary) or '.', exist_ok=True)
+    write_binary(output_binary, main_blocks)
+    write_verify_manifest(output_binary + '.verify.json', records, template_sha256=headers[0]['template_sha256'])
+    print(f"   ✅ Main: {output_binary}")
+    write_diff_binary(official_binary, None, diff_output_binary, diff_blocks=diff_blocks)
+    return True
+
+def write_minimal_diff(diff_output_binary):
+    """Write an empty diff file (16 bytes header only)."""
+    with open(diff_output_binary, 'wb') as f:
+        f.write(b'\xEF\xBE\xAD\xDE\x01\x00\x00\x00')  # Magic + version
+        f.write(struct.pack('<I', 0))  # offset_count = 0
+        f.write(struct.pack('<I', 0))  # comp_block_len = 0
+
+def write_diff_binary(official_binary, diff_output_dat_dir, diff_output_binary, compress_cache=None, diff_blocks=None):
+    """Create the diff file (required by the game).
+    
+    Strategy: Copy official diff file to pass game verification.
+    If official diff doesn't exist or is empty, pack the changed entries,
+    or create a minimal diff if nothing changed.
+    
+    Args:
+        diff_blocks: Already compressed diff blocks (used instead of diff_output_dat_dir)
+    """
+    official_diff_file = official_binary + '_diff'
+    if os.path.exists(official_diff_file) and os.path.getsize(official_diff_file) > 16:
+        # Copy official diff file (common modding technique to pass verification)
+        print(f"   📋 Copying official diff file for verification...")
+        shutil.copy2(official_diff_file, diff_output_binary)
+        print(f"   ✅ Diff file copied from official: {diff_output_binary}")
+        print(f"   ℹ️  Using official diff to pass game file verification")
+    elif diff_blocks is not None or (diff_output_dat_dir and os.path.exists(diff_output_dat_dir)):
+        # Create diff from changed .dat files (if we have changes)
+        if diff_blocks is None:
+            files = sorted_dat_files(diff_output_dat_dir)
+            diff_blocks = [block for _, block in compress_dat_files(diff_output_dat_dir, files,
+                                                                    compress_cache=compress_cache)]
+        if diff_blocks:
+            write_binary(diff_output_binary, diff_blocks)
+            print(f"   ✅ Diff file created from changes: {diff_output_binary}")
+        else:
+            # Create minimal empty diff file (16 bytes header only)
+            print(f"   ⚠️  No changes detected, creating minimal diff file...")
+            write_minimal_diff(diff_output_binary)
+            print(f"   ✅ Minimal diff file created: {diff_output_binary}")
+    else:
+        # Fallback: create minimal empty diff
+        print(f"   ⚠️  Creating minimal diff file (fallback)...")
+        write_minimal_diff(diff_output_binary)
+        print(f"   ✅ Minimal diff file created: {diff_output_binary}")
+
+def parse_shard(value):
+    """Parse a --shard value 'i/N' into (i, N) with 1 <= i <= N."""
+    import argparse
+    
+    match = re.fullmatch(r'(\d+)/(\d+)', value)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise argparse.ArgumentTypeError(f"expected i/N with 1 <= i <= N, got '{value}'")
+    return int(match.group(1)), int(match.group(2))
+
+def merge_main(argv):
+    """Merge command: assemble final binaries from shard artifacts."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='repack_translations.py merge',
+                                     description='Assemble repacked binaries from shard artifacts (see --shard)')
+    parser.add_argument('--output-binary', action='append', default=None,
+                       help='Output binary file, as passed to the sharded runs (repeatable; default: language/mod/translate_words_map_vi)')
+    parser.add_argument('--output-diff', action='append', default=None,
+                       help='Output diff binary file, as passed to the sharded runs (default: the one recorded in the shards; repeat once per --output-binary)')
+    parser.add_argument('--official-binary', default=None,
+                       help='Official binary file, as passed to the sharded runs (its _diff is copied if present; default: the one recorded in the shards)')
+    parser.add_argument('--shard-dir', default=None,
+                       help='Directory containing the shard artifacts (default: next to each output binary)')
+    parser.add_argument('--shards', type=int, default=None,
+                       help='Shard count N of the runs to merge (default: the only complete set of artifacts)')
+    
+    args = parser.parse_args(argv)
+    output_binaries = args.output_binary or ['language/mod/translate_words_map_vi']
+    if args.output_diff and len(args.output_diff) != len(output_binaries):
+        parser.error('--output-diff must be given once per --output-binary')
+    
+    for i, output_binary in enumerate(output_binaries):
+        diff_output_binary = args.output_diff[i] if args.output_diff else None
+        shard_dir = args.shard_dir or os.path.dirname(output_binary)
+        pattern = os.path.join(shard_dir, glob.escape(os.path.basename(output_binary)) + '.shard*-of-*')
+        
+        # Group artifacts by shard count: runs with another N may have left theirs behind
+        groups = {}
+        for shard_file in glob.glob(pattern):
+            match = re.search(r'\.shard(\d+)-of-(\d+)$', shard_file)
+            if match:
+                groups.setdefault(int(match.group(2)), {})[int(match.group(1))] = shard_file
+        if args.shards is not None:
+            shard_count = args.shards
+        else:
+            complete = [n for n, files in groups.items() if set(files) == set(range(1, n + 1))]
+            if complete:
+                # Several complete sets: the most recently built one wins
+                shard_count = max(complete, key=lambda n: max(os.path.getmtime(f) for f in groups[n].values()))
+                if len(groups) > 1:
+                    print(f"   ℹ️  Using the {shard_count}-shard artifacts (pass --shards N to choose another set)")
+            elif len(groups) == 1:
+                shard_count = next(iter(groups))
+            else:
+                found = ', '.join(f"{len(groups[n])} of {n}" for n in sorted(groups)) or 'none'
+                print(f"❌ Cannot choose shard artifacts for {output_binary} (found: {found}); pass --shards N")
+                return 1
+        shard_files = [groups.get(shard_count, {})[i] for i in sorted(groups.get(shard_count, {}))]
+        
+        print(f"🧩 Merging {len(shard_files)} shard artifact(s) into {output_binary}...")
+        if not merge_shards(shard_files, output_binary, diff_output_binary, args.official_binary):
+            return 1
+        for shard_file in shard_files:
+            os.remove(shard_file)
+        print(f"   🗑️  Removed {len(shard_files)} merged shard artifact(s)")
+    
+    print("✅ Merge complete")
+    return 0
+
+def export_main(argv):
+    """Export command: convert the template to CSV or XLIFF for CAT tools."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='repack_translations.py export',
+                                     description='Export the translation template to CSV or XLIFF (format from the output extension)')
+    parser.add_argument('output', help='Output file (.csv, .xlf or .xliff)')
+    parser.add_argument('--template', default='translation/translation_template.json',
+                       help='Translation template JSON file')
+    parser.add_argument('--source-column', default='English',
+                       help='Column exported as XLIFF <source> (default: English)')
+    parser.add_argument('--target-column', default='Target',
+                       help='Column exported as XLIFF <target> (default: Target)')
+    parser.add_argument('--source-lang', default='en',
+                       help='XLIFF source language code (default: en)')
+    parser.add_argument('--target-lang', default='vi',
+                       help='XLIFF target language code (default: vi)')
+    parser.add_argument('--xliff-version', choices=['1.2', '2.0'], default='1.2',
+                       help='XLIFF version (default: 1.2)')
+    
+    args = parser.parse_args(argv)
+    print(f"📤 Exporting {args.template} → {args.output}...")
+    count = export_template(args.template, args.output, source_column=args.source_column,
+                            target_column=args.target_column, source_lang=args.source_lang,
+                            target_lang=args.target_lang, xliff_version=args.xliff_version)
+    print(f"   ✅ {count} rows exported")
+    return 0
+
+def import_main(argv):
+    """Import command: convert a CSV or XLIFF file back to a JSON template."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='repack_translations.py import',
+                                     description='Import a CSV or XLIFF file (from the export command) as a JSON template')
+    parser.add_argument('input', help='Input file (.csv, .xlf or .xliff)')
+    parser.add_argument('--output', default='translation/translation_template.json',
+                       help='Output JSON template (default: translation/translation_template.json)')
+    
+    args = parser.parse_args(argv)
+    if os.path.abspath(args.input) == os.path.abspath(args.output):
+        parser.error('input and output must be different files')
+    print(f"📥 Importing {args.input} → {args.output}...")
+    count = import_template(args.input, args.output)
+    print(f"   ✅ {count} rows imported")
+    return 0
+
+def check_glossary_main(argv):
+    """Check-glossary command: report translations that break the glossary."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='repack_translations.py check-glossary',
+                                     description='Check template translations against a glossary')
+    parser.add_argument('--glossary', required=True,
+                       help='Glossary CSV (columns: term, translation; alternatives separated by |)')
+    parser.add_argument('--template', default='translation/translation_template.json',
+                       help='Translation template (JSON, CSV or XLIFF)')
+    parser.add_argument('--source-column', default='English',
+                       help='Template column the glossary terms are matched in (default: English)')
+    parser.add_argument('--target-column', action='append', default=None,
+                       help='Column to check (repeatable, default: Target)')
+    parser.add_argument('--report', default=None,
+                       help='Write all violations to this CSV file')
+    parser.add_argument('--limit', type=int, default=50,
+                       help='Maximum number of violations to print per column (default: 50)')
+    
+    args = parser.parse_args(argv)
+    
+    glossary = load_glossary(args.glossary)
+    rows = load_template(args.template)
+    print(f"📖 Checking {len(rows)} rows against {len(glossary)} glossary terms...")
+    
+    all_violations = []
+    for target_column in args.target_column or ['Target']:
+        violations = check_glossary(rows, glossary, source_column=args.source_column,
+                                    target_column=target_column)
+        print(f"   {target_column}: {len(violations)} violation(s)")
+        print_glossary_violations(violations, target_column, limit=args.limit)
+        all_violations.extend((target_column,) + v for v in violations)
+    
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['column', 'ID', 'term', 'translation'])
+            for target_column, id_hex, term, translations in all_violations:
+                writer.writerow([target_column, id_hex, term, '|'.join(translations)])
+        print(f"   💾 Saved: {args.report}")
+    
+    if all_violations:
+        print(f"❌ Glossary check failed: {len(all_violations)} violation(s)")
+        return 1
+    print("✅ Glossary check passed")
+    return 0
 
 def main():
     """Main function."""
     import argparse
     
+    # Subcommands (plain `repack_translations.py [options]` still runs the repack)
+    commands = {
+        'verify': verify_main,
+        'check-glossary': check_glossary_main,
+        'merge': merge_main,
+        'export': export_main,
+        'import': import_main,
+    }
+    if len(sys.argv) > 1 and sys.argv[1] in commands:
+        sys.exit(commands[sys.argv[1]](sys.argv[2:]))
+    
     parser = argparse.ArgumentParser(description='Repack translations to binary')
     parser.add_argument('--template', default='translation/translation_template.json',
-                       help='Translation template JSON file')
+                       help='Translation template (JSON, or CSV/XLIFF exported with the export command)')
     parser.add_argument('--source-binary', default='language/source/translate_words_map_zh_cn',
                        help='Source binary file (default: Chinese, used as template)')
     parser.add_argument('--official-binary', default='language/source/translate_words_map_zh_cn',
                        help='Official binary file for diff comparison (default: Chinese)')
-    parser.add_argument('--output-binary', default='language/mod/translate_words_map_vi',
-                       help='Output binary file')
-    parser.add_argument('--output-diff', default=None,
-                       help='Output diff binary file (default: output_binary + _diff)')
+    parser.add_argument('--output-binary', action='append', default=None,
+                       help='Output binary file (repeat together with --target-column to pack several targets in one run; default: language/mod/translate_words_map_vi)')
+    parser.add_argument('--output-diff', action='append', default=None,
+                       help='Output diff binary file (default: output_binary + _diff; repeat once per --output-binary)')
     parser.add_argument('--temp-dir', default='temp_repack',
                        help='Temporary directory for .dat files')
     parser.add_argument('--mode', choices=['target', 'autofill'], default='autofill',
                        help='Translation mode: target (use target column only), autofill (use target, fallback to autofill column)')
-    parser.add_argument('--target-column', default='Target',
-                       help='Column name to use as primary translation source (default: Target)')
+    parser.add_argument('--target-column', action='append', default=None,
+                       help='Column name to use as primary translation source (default: Target; repeat once per --output-binary)')
     parser.add_argument('--autofill-column', default='English',
                        help='Column name to use for autofill when target is empty (default: English)')
+    parser.add_argument('--dedup-texts', action='store_true',
+                       help='Store identical texts once per block (smaller output, same content)')
+    parser.add_argument('--glossary', default=None,
+                       help='Glossary CSV (columns: term, translation); repack stops if a target breaks it')
+    parser.add_argument('--glossary-column', default='English',
+                       help='Template column the glossary terms are matched in (default: English)')
+    parser.add_argument('--shard', type=parse_shard, default=None,
+                       help='Only build block range i of N (e.g. 2/4) and write a shard artifact; combine with the merge command')
     
     args = parser.parse_args()
     
+    # Pair each target column with its output binary (and optional diff output)
+    target_columns = args.target_column or ['Target']
+    output_binaries = args.output_binary or ['language/mod/translate_words_map_vi']
+    if len(target_columns) != len(output_binaries):
+        parser.error('--target-column and --output-binary must be given the same number of times')
+    if args.output_diff and len(args.output_diff) != len(output_binaries):
+        parser.error('--output-diff must be given once per --output-binary')
+    
     print("=" * 60)
     print("Repack Translations")
     print("=" * 60)
@@ -452,19 +1458,45 @@ def main():
     print("⚠️  Note: Diff file will be created automatically for game compatibility")
     print()
     
-    os.makedirs(os.path.dirname(args.output_binary), exist_ok=True)
+    targets = []
+    for i, (target_column, output_binary) in enumerate(zip(target_columns, output_binaries)):
+        os.makedirs(os.path.dirname(output_binary), exist_ok=True)
+        
+        # Always create diff file (required for game compatibility)
+        if args.output_diff:
+            diff_output_binary = args.output_diff[i]
+        else:
+            # Auto-generate diff filename
+            base_path = os.path.splitext(output_binary)[0]
+            diff_output_binary = base_path + '_diff'
+        os.makedirs(os.path.dirname(diff_output_binary), exist_ok=True)
+        targets.append((target_column, output_binary, diff_output_binary))
     
-    # Always create diff file (required for game compatibility)
-    if args.output_diff:
-        diff_output_binary = args.output_diff
-    else:
-        # Auto-generate diff filename
-        base_path = os.path.splitext(args.output_binary)[0]
-        diff_output_binary = base_path + '_diff'
-    os.makedirs(os.path.dirname(diff_output_binary), exist_ok=True)
+    # The template is loaded first so a glossary failure stops before any extraction
+    print("📋 Loading template...")
+    rows = load_template(args.template)
+    print(f"   ✅ Template: {len(rows)} rows")
+    
+    # Check glossary before packing anything
+    if args.glossary:
+        print(f"📖 Checking glossary: {args.glossary}")
+        glossary = load_glossary(args.glossary)
+        failed = False
+        for target_column, _, _ in targets:
+            violations = check_glossary(rows, glossary, source_column=args.glossary_column,
+                                        target_column=target_column)
+            if violations:
+                print(f"   ⚠️  {target_column}: {len(violations)} glossary violation(s)")
+                print_glossary_violations(violations, target_column)
+                failed = True
+            else:
+                print(f"   ✅ {target_column}: {len(glossary)} terms, no violations")
+        if failed:
+            print("❌ Glossary check failed, fix the translations above before repacking")
+            sys.exit(1)
     
     # Step 1: Extract source to .dat
-    print("📦 Step 1: Extracting source binary...")
+    print("\n📦 Step 1: Extracting source binary...")
     source_dat_dir = os.path.join(args.temp_dir, "source_dat")
     if not extract_file_to_dat(args.source_binary, source_dat_dir):
         print("❌ Failed to extract source binary")
@@ -480,64 +1512,154 @@ def main():
     else:
         print("   ✅ Official binary extracted")
     
-    # Step 2: Pack text to .dat
-    print(f"\n📝 Step 2: Packing translations to .dat (mode: {args.mode})...")
-    output_dat_dir = os.path.join(args.temp_dir, "output_dat")
-    diff_output_dat_dir = os.path.join(args.temp_dir, "diff_dat")  # Always create diff
-    if not pack_text_to_dat(args.template, source_dat_dir, output_dat_dir, 
-                           mode=args.mode,
-                           target_column=args.target_column,
-                           autofill_column=args.autofill_column,
-                           official_dat_dir=official_dat_dir,
-                           diff_output_dir=diff_output_dat_dir):
-        print("❌ Failed to pack translations")
-        return
-    
-    # Step 3: Pack .dat to binary
-    print("\n📦 Step 3: Packing .dat to binary...")
-    pack_dat_to_binary(output_dat_dir, args.output_binary)
+    # Source entries, official texts, template rows and compressed blocks are
+    # shared by all targets, so each is decoded/parsed/compressed only once
+    print("\n📋 Loading shared inputs...")
+    official_texts = extract_official_texts(official_dat_dir)
+    print(f"   ✅ Found {len(official_texts)} official texts")
+    template_sha256 = hash_file(args.template)
+    # Parsed source entries are only kept when several targets reuse them
+    source_cache = {} if len(targets) > 1 else None
+    compress_cache = None
     
-    # Step 3b: Create diff file (REQUIRED)
-    # Strategy: Copy official diff file to pass game verification
-    # If official diff doesn't exist or is empty, create minimal diff
-    print("\n📦 Step 3b: Creating diff file (required for game verification)...")
+    # Sharded repack: only build one contiguous range of blocks
+    shard_files = None
+    if args.shard:
+        shard_index, shard_count = args.shard
+        block_files = sorted_dat_files(source_dat_dir)
+        start = (shard_index - 1) * len(block_files) // shard_count
+        end = shard_index * len(block_files) // shard_count
+        shard_files = block_files[start:end]
+        print(f"\n🧩 Shard {shard_index}/{shard_count}: blocks {start}-{end - 1} of {len(block_files)}")
     
-    official_diff_file = args.official_binary + '_diff'
-    if os.path.exists(official_diff_file) and os.path.getsize(official_diff_file) > 16:
-        # Copy official diff file (common modding technique to pass verification)
-        print(f"   📋 Copying official diff file for verification...")
-        shutil.copy2(official_diff_file, diff_output_binary)
-        print(f"   ✅ Diff file copied from official: {diff_output_binary}")
-        print(f"   ℹ️  Using official diff to pass game file verification")
-    elif diff_output_dat_dir and os.path.exists(diff_output_dat_dir):
-        # Create diff from extracted .dat files (if we have changes)
-        files = [f for f in os.listdir(diff_output_dat_dir) if f.endswith('.dat')]
-        if files:
-            pack_dat_to_binary(diff_output_dat_dir, diff_output_binary)
-            print(f"   ✅ Diff file created from changes: {diff_output_binary}")
-        else:
-            # Create minimal empty diff file (16 bytes header only)
-            print(f"   ⚠️  No changes detected, creating minimal diff file...")
-            with open(diff_output_binary, 'wb') as f:
-                f.write(b'\xEF\xBE\xAD\xDE\x01\x00\x00\x00')  # Magic + version
-                f.write(struct.pack('<I', 0))  # offset_count = 0
-                f.write(struct.pack('<I', 0))  # comp_block_len = 0
-            print(f"   ✅ Minimal diff file created: {diff_output_binary}")
-    else:
-        # Fallback: create minimal empty diff
-        print(f"   ⚠️  Creating minimal diff file (fallback)...")
-        with open(diff_output_binary, 'wb') as f:
-            f.write(b'\xEF\xBE\xAD\xDE\x01\x00\x00\x00')  # Magic + version
-            f.write(struct.pack('<I', 0))  # offset_count = 0
-            f.write(struct.pack('<I', 0))  # comp_block_len = 0
-        print(f"   ✅ Minimal diff file created: {diff_output_binary}")
+    for i, (target_column, output_binary, diff_output_binary) in enumerate(targets):
+        if len(targets) > 1:
+            print(f"\n🎯 Target {i + 1}/{len(targets)}: {target_column} → {output_binary}")
+        
+        if len(targets) > 1:
+            # Identical blocks repeat between targets: keep only the previous target's blocks
+            compress_cache = ChainMap({}, compress_cache.maps[0] if compress_cache else {})
+        
+        # Step 2: Pack text to .dat
+        print(f"\n📝 Step 2: Packing translations to .dat (mode: {args.mode})...")
+        output_dat_dir = os.path.join(args.temp_dir, f"output_dat_{i}")
+        diff_output_dat_dir = os.path.join(args.temp_dir, f"diff_dat_{i}")  # Always create diff
+        if not pack_text_to_dat(args.template, source_dat_dir, output_dat_dir,
+                               mode=args.mode,
+                               target_column=target_column,
+                               autofill_column=args.autofill_column,
+                               diff_output_dir=diff_output_dat_dir,
+                               rows=rows,
+                               official_texts=official_texts,
+                               source_cache=source_cache,
+                               dedup_texts=args.dedup_texts,
+                               only_files=set(shard_files) if shard_files is not None else None):
+            print("❌ Failed to pack translations")
+            return
+        
+        if args.shard:
+            # Step 3 (shard): Compress this block range into a shard artifact
+            print("\n📦 Step 3: Compressing shard blocks...")
+            main_packed = compress_dat_files(output_dat_dir, sorted_dat_files(output_dat_dir),
+                                             compress_cache=compress_cache)
+            diff_packed = compress_dat_files(diff_output_dat_dir, sorted_dat_files(diff_output_dat_dir),
+                                             compress_cache=compress_cache)
+            shard_file = f"{output_binary}.shard{shard_index}-of-{shard_count}"
+            settings = {
+                'source_binary': args.source_binary,
+                'official_binary': args.official_binary,
+                'output_diff': diff_output_binary,
+                'mode': args.mode,
+                'target_column': target_column,
+                'autofill_column': args.autofill_column,
+                'dedup_texts': args.dedup_texts
+            }
+            write_shard(shard_file, shard_index, shard_count, len(block_files), main_packed, diff_packed,
+                        template_sha256=template_sha256, settings=settings)
+            print(f"   💾 Saved: {shard_file}")
+            shutil.rmtree(output_dat_dir, ignore_errors=True)
+            shutil.rmtree(diff_output_dat_dir, ignore_errors=True)
+            continue
+        
+        # Step 3: Pack .dat to binary
+        print("\n📦 Step 3: Packing .dat to binary...")
+        blocks = pack_dat_to_binary(output_dat_dir, output_binary, compress_cache=compress_cache)
+        write_verify_manifest(output_binary + '.verify.json', blocks, template_sha256=template_sha256)
+        
+        # Step 3b: Create diff file (REQUIRED)
+        print("\n📦 Step 3b: Creating diff file (required for game verification)...")
+        write_diff_binary(args.official_binary, diff_output_dat_dir, diff_output_binary,
+                          compress_cache=compress_cache)
+        
+        # Free disk space before the next target
+        shutil.rmtree(output_dat_dir, ignore_errors=True)
+        shutil.rmtree(diff_output_dat_dir, ignore_errors=True)
     
     # Cleanup
     shutil.rmtree(args.temp_dir, ignore_errors=True)
     
+    if args.shard:
+        print(f"\n✅ Shard {shard_index}/{shard_count} complete! When all shards are built, run:")
+        print(f"   python tools/repack_translations.py merge --official-binary {args.official_binary} " +
+              " ".join(f"--output-binary {output_binary} --output-diff {diff_output_binary}"
+                       for _, output_binary, diff_output_binary in targets))
+        return
+    
     print(f"\n✅ Complete! Output files:")
-    print(f"   - Main: {args.output_binary}")
-    print(f"   - Diff: {diff_output_binary} (REQUIRED for game)")
+    for target_column, output_binary, diff_output_binary in targets:
+        print(f"   - Main: {output_binary}")
+        print(f"   - Diff: {diff_output_binary} (REQUIRED for game)")
+        print(f"   - Verify manifest: {output_binary}.verify.json (not needed by game)")
+
+def verify_main(argv):
+    """Verify command: check a repacked binary against its verify manifest."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog='repack_translations.py verify',
+                                     description='Verify a repacked binary against the hashes recorded while packing')
+    parser.add_argument('--binary', default='language/mod/translate_words_map_vi',
+                       help='Repacked binary file to verify')
+    parser.add_argument('--manifest', default=None,
+                       help='Verify manifest (default: binary + .verify.json, skipped if missing)')
+    parser.add_argument('--template', default='translation/translation_template.json',
+                       help='Translation template, JSON, CSV or XLIFF (compared with the binary entry by entry)')
+    parser.add_argument('--source-binary', default='language/source/translate_words_map_zh_cn',
+                       help='Source binary used when packing (default: Chinese)')
+    parser.add_argument('--mode', choices=['target', 'autofill'], default='autofill',
+                       help='Translation mode used when packing')
+    parser.add_argument('--target-column', default='Target',
+                       help='Target column used when packing (default: Target)')
+    parser.add_argument('--autofill-column', default='English',
+                       help='Autofill column used when packing (default: English)')
+    parser.add_argument('--jobs', type=int, default=None,
+                       help='Worker processes (default: CPU count)')
+    
+    args = parser.parse_args(argv)
+    manifest_file = args.manifest or args.binary + '.verify.json'
+    if not args.manifest and not os.path.exists(manifest_file):
+        manifest_file = None
+    template_file = args.template if os.path.exists(args.template) else None
+    source_binary = args.source_binary if os.path.exists(args.source_binary) else None
+    if not manifest_file and not (template_file and source_binary):
+        print("❌ Nothing to verify against: no manifest, and no template with its source binary")
+        return 1
+    
+    print(f"🔍 Verifying {args.binary}...")
+    if manifest_file:
+        print(f"   - Manifest: {manifest_file}")
+    if template_file and source_binary:
+        print(f"   - Template: {template_file} (source: {source_binary})")
+    problems = verify_binary(args.binary, manifest_file, template_file=template_file,
+                             source_binary=source_binary,
+                             mode=args.mode, target_column=args.target_column,
+                             autofill_column=args.autofill_column, jobs=args.jobs)
+    for problem in problems:
+        print(f"   ❌ {problem}")
+    if problems:
+        print(f"❌ Verification failed: {len(problems)} problem(s)")
+        return 1
+    print("✅ Verification passed")
+    return 0
 
 if __name__ == "__main__":
     main()